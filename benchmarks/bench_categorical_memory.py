@@ -0,0 +1,48 @@
+import timeit
+from pathlib import Path
+
+import pandas as pd
+from pandera.typing import DataFrame
+
+from myfinances.config_utils import Configs, to_config
+from myfinances.label_data import TransactionLabeled
+from myfinances.main import get_labled_data
+
+CONFIG: Path = Path(__file__).parents[1] / 'test/data/config/default_public.yaml'
+COLUMNS: list[str] = [
+    TransactionLabeled.Account,
+    TransactionLabeled.Label,
+    TransactionLabeled.Sublabel,
+]
+
+
+def compare_labels(df: pd.DataFrame) -> pd.Series:
+    return (df[TransactionLabeled.Label] == 'food') & (
+        df[TransactionLabeled.Sublabel] == 'groceries'
+    )
+
+
+def main() -> None:
+    df: DataFrame[TransactionLabeled] = get_labled_data(to_config(CONFIG, Configs))
+    df_object: pd.DataFrame = df.astype({column: object for column in COLUMNS})
+
+    print(f'Memory footprint of {df.shape[0]} labeled transactions (regression dataset)')
+    for column in COLUMNS:
+        before: int = df_object[column].memory_usage(deep=True, index=False)
+        after: int = df[column].memory_usage(deep=True, index=False)
+        print(f'{column:>10}: {before / 1024:8.1f} KiB -> {after / 1024:8.1f} KiB')
+    before = df_object.memory_usage(deep=True).sum()
+    after = df.memory_usage(deep=True).sum()
+    print(f'{"total":>10}: {before / 1024:8.1f} KiB -> {after / 1024:8.1f} KiB')
+
+    df_large: pd.DataFrame = pd.concat([df] * 500, ignore_index=True)
+    df_large_object: pd.DataFrame = pd.concat([df_object] * 500, ignore_index=True)
+    time_object: float = min(timeit.repeat(lambda: compare_labels(df_large_object), number=5))
+    time_categorical: float = min(timeit.repeat(lambda: compare_labels(df_large), number=5))
+    print(f'Label/Sublabel comparison on {df_large.shape[0]} rows')
+    print(f'object:      {time_object / 5 * 1000:.1f} ms')
+    print(f'categorical: {time_categorical / 5 * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from myfinances.parse_data import parse_text
+
+N_ROWS: int = 1_000_000
+TEXT_KEYS: list[str] = ['Payee', 'Purpose', 'Reference']
+
+
+def parse_text_rowwise(df: pd.DataFrame, text_keys: list[str]) -> pd.Series:
+    df.fillna('-', inplace=True)
+    text: pd.Series = df.loc[:, text_keys].agg(';'.join, axis=1)
+    return text
+
+
+def make_raw_frame(n_rows: int) -> pd.DataFrame:
+    rng: np.random.Generator = np.random.default_rng(0)
+    df: pd.DataFrame = pd.DataFrame(
+        {
+            key: rng.choice([f'{key} {i}' for i in range(1000)] + [np.nan], n_rows)
+            for key in TEXT_KEYS
+        }
+    )
+    df['Amount'] = rng.normal(size=n_rows)
+    df['Unused'] = rng.choice(['x', np.nan], n_rows)
+    return df
+
+
+def main() -> None:
+    df: pd.DataFrame = make_raw_frame(N_ROWS)
+    pd.testing.assert_series_equal(
+        parse_text(df.copy(), TEXT_KEYS), parse_text_rowwise(df.copy(), TEXT_KEYS)
+    )
+    rowwise: float = min(timeit.repeat(lambda: parse_text_rowwise(df.copy(), TEXT_KEYS), number=1))
+    vectorized: float = min(timeit.repeat(lambda: parse_text(df.copy(), TEXT_KEYS), number=1))
+    print(f'parse_text on {N_ROWS} rows')
+    print(f'row-wise:   {rowwise:.3f} s')
+    print(f'vectorized: {vectorized:.3f} s ({rowwise / vectorized:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+class AhoCorasick:
+    def __init__(self, patterns: list[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.outputs: list[list[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            self._add(pattern, pattern_id)
+        self._link()
+
+    def _add(self, pattern: str, pattern_id: int) -> None:
+        state: int = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.outputs[state].append(pattern_id)
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self.goto[0].values())
+        while queue:
+            state: int = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback: int = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def find_all(self, text: str) -> set[int]:
+        matches: set[int] = set(self.outputs[0])
+        state: int = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            matches.update(self.outputs[state])
+        return matches
+
+
+def match_texts(texts: list[str], patterns: list[str]) -> list[list[int]]:
+    automaton: AhoCorasick = AhoCorasick(patterns)
+    return [sorted(automaton.find_all(text)) for text in texts]
+
+
+def match_texts_parallel(
+    texts: list[str], pattern_sets: list[list[str]], n_workers: int
+) -> list[list[list[int]]]:
+    encoded: list[bytes] = [text.encode() for text in texts]
+    offsets: np.ndarray = np.cumsum([0] + [len(text) for text in encoded])
+    shared_texts: SharedMemory = SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    try:
+        shared_texts.buf[: offsets[-1]] = b''.join(encoded)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            matches: list[list[list[int]]] = list(
+                executor.map(
+                    match_shared_texts,
+                    [shared_texts.name] * len(pattern_sets),
+                    [offsets] * len(pattern_sets),
+                    pattern_sets,
+                )
+            )
+    finally:
+        shared_texts.close()
+        shared_texts.unlink()
+    return matches
+
+
+def match_shared_texts(name: str, offsets: np.ndarray, patterns: list[str]) -> list[list[int]]:
+    shared_texts: SharedMemory = SharedMemory(name=name)
+    try:
+        data: bytes = bytes(shared_texts.buf[: offsets[-1]])
+    finally:
+        shared_texts.close()
+    texts: list[str] = [data[start:end].decode() for start, end in zip(offsets[:-1], offsets[1:])]
+    return match_texts(texts, patterns)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 import yaml
 from loguru import logger as log
@@ -115,10 +115,15 @@ class InputConfig(BaseModel):
     Files: Annotated[list[Path], BeforeValidator(ensure_path)]
     Delimiter: str
     Decimal: str
+    Thousands: str | None = None
     DateKey: str
     DateFormat: str
     AmountKey: str
     TextKeys: list[str]
+    Engine: Literal['c', 'python', 'pyarrow'] = 'c'
+    UseThreads: bool = True
+    MemoryMap: bool = False
+    DtypeBackend: Literal['numpy', 'pyarrow'] = 'numpy'
 
 
 class Configs(BaseModel):
@@ -1,18 +1,21 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from loguru import logger as log
 from pandera.typing import DataFrame
 
+from myfinances.aho_corasick import AhoCorasick
 from myfinances.config_utils import load_yaml
 from myfinances.parse_data import Transaction
-from myfinances.utils import get_rows_by_string
+from myfinances.utils import get_first_matches
 
 
 def drop_data(df: DataFrame[Transaction], drop_transaction_config: Path) -> DataFrame[Transaction]:
-    df = df.drop_duplicates()  # type:ignore
     if drop_transaction_config.is_file():
         df = drop_transaction_by_config(df, drop_transaction_config)
+    if isinstance(df[Transaction.Text].dtype, pd.CategoricalDtype):
+        df = df.assign(Text=df[Transaction.Text].cat.remove_unused_categories())  # type: ignore
     return df
 
 
@@ -20,30 +23,33 @@ def drop_transaction_by_config(
     df: DataFrame[Transaction], drop_transaction_config: Path
 ) -> DataFrame[Transaction]:
     drop_transactions: dict = load_yaml(drop_transaction_config)
-    for reason, transactions in drop_transactions.items():
-        for transaction in transactions:
-            df = drop_transaction_by_key_and_reason(df, transaction, reason)
-    return df
-
-
-def drop_transaction_by_key_and_reason(
-    df: DataFrame[Transaction], transaction: str, reason: str
-) -> DataFrame[Transaction]:
-    rows_to_drop: pd.Series = get_rows_by_string(df, transaction)
-    df = drop_by_bool(df, rows_to_drop, reason, transaction)
-    return df
-
-
-def drop_by_bool(
-    df: DataFrame[Transaction], to_drop: pd.Series, reason: str, transaction: str
-) -> DataFrame[Transaction]:
-    entries_before: int = df.shape[0]
-    df = df.loc[~to_drop]
-    entries_dropped: int = entries_before - df.shape[0]
-
-    check_dropped(entries_dropped, reason, transaction)
-    log.debug(f'Dropped {entries_dropped} with reason {reason}')
-    return df
+    drop_rules: list[tuple[str, str]] = get_drop_rules(drop_transactions)
+    to_drop, hits = match_drop_rules(df, drop_rules)
+    for (reason, transaction), entries_dropped in zip(drop_rules, hits):
+        check_dropped(entries_dropped, reason, transaction)
+        log.debug(f'Dropped {entries_dropped} with reason {reason}')
+    return df.loc[~to_drop]  # type: ignore
+
+
+def get_drop_rules(drop_transactions: dict[str, list[str]]) -> list[tuple[str, str]]:
+    return [
+        (reason, transaction)
+        for reason, transactions in drop_transactions.items()
+        for transaction in transactions
+    ]
+
+
+def match_drop_rules(
+    df: DataFrame[Transaction],
+    drop_rules: list[tuple[str, str]],
+    automaton: AhoCorasick | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    if automaton is None:
+        automaton = AhoCorasick([transaction for _, transaction in drop_rules])
+    first_matches: np.ndarray = get_first_matches(df, automaton)
+    to_drop: np.ndarray = first_matches >= 0
+    hits: np.ndarray = np.bincount(first_matches[to_drop], minlength=len(drop_rules))
+    return to_drop, hits
 
 
 def check_dropped(entries_dropped: int, reason: str, transaction: str) -> None:
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+ROW_HASH: str = 'RowHash'
+FINGERPRINT: str = 'Fingerprint'
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    content: pd.DataFrame = df.drop(columns=[ROW_HASH, FINGERPRINT], errors='ignore')
+    return pd.util.hash_pandas_object(content, index=False).to_numpy()
+
+
+def count_occurrences(row_hashes: np.ndarray, known_counts: pd.Series | None = None) -> np.ndarray:
+    occurrences: np.ndarray = pd.Series(row_hashes).groupby(row_hashes).cumcount().to_numpy()
+    if known_counts is not None and not known_counts.empty:
+        occurrences += pd.Series(row_hashes).map(known_counts).fillna(0).to_numpy(dtype=int)
+    return occurrences
+
+
+def get_fingerprints(row_hashes: np.ndarray, occurrences: np.ndarray) -> np.ndarray:
+    hashes: pd.DataFrame = pd.DataFrame({ROW_HASH: row_hashes, 'Occurrence': occurrences})
+    return pd.util.hash_pandas_object(hashes, index=False).to_numpy()
+
+
+def add_fingerprints(df: pd.DataFrame, df_known: pd.DataFrame | None = None) -> pd.DataFrame:
+    row_hashes: np.ndarray = hash_rows(df)
+    known_counts: pd.Series | None = None
+    if df_known is not None:
+        known_counts = df_known[ROW_HASH].value_counts()
+    occurrences: np.ndarray = count_occurrences(row_hashes, known_counts)
+    return df.assign(
+        **{ROW_HASH: row_hashes, FINGERPRINT: get_fingerprints(row_hashes, occurrences)}
+    )
+
+
+def pop_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    if FINGERPRINT not in df.columns:
+        return add_fingerprints(df)[FINGERPRINT].to_numpy()
+    fingerprints: np.ndarray = df.pop(FINGERPRINT).to_numpy()
+    df.pop(ROW_HASH)
+    return fingerprints
+
+
+def find_overlapping_rows(fingerprints: list[np.ndarray]) -> np.ndarray:
+    if not fingerprints:
+        return np.zeros(0, dtype=bool)
+    return pd.Series(np.concatenate(fingerprints)).duplicated().to_numpy()
+
+
+def is_in_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    if sorted_values.size == 0:
+        return np.zeros(values.shape, dtype=bool)
+    positions: np.ndarray = np.searchsorted(sorted_values, values).clip(max=sorted_values.size - 1)
+    return sorted_values[positions] == values
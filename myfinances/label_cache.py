@@ -0,0 +1,83 @@
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from myfinances.config_utils import LabelConfig
+from myfinances.parse_cache import ParseCache, entry_key, source_of
+
+LABEL_CACHE_DIR: str = 'labels'
+
+
+class LabelCache:
+    def __init__(
+        self, cache_dir: Path, label_configs: list[LabelConfig], sources: list[str]
+    ) -> None:
+        self.cache: ParseCache = ParseCache(cache_dir / LABEL_CACHE_DIR)
+        self.keys: list[str] = [
+            label_cache_key(source, label_config)
+            for source, label_config in zip(sources, label_configs)
+        ]
+        self.matches: list[dict[str, list[int]]] = [self.load(key) for key in self.keys]
+        self.cache.evict(
+            self.keys, {source: [source_of(key)] for source, key in zip(sources, self.keys)}
+        )
+        self.changed: list[bool] = [False] * len(self.keys)
+        self.texts_in_use: set[str] = set()
+
+    def load(self, key: str) -> dict[str, list[int]]:
+        df: pd.DataFrame | None = self.cache.load(key)
+        if df is None:
+            return {}
+        return {text: list(rules) for text, rules in zip(df['Text'], df['Rules'])}
+
+    def store(self, key: str, matches: dict[str, list[int]]) -> None:
+        self.cache.store(key, pd.DataFrame({'Text': matches.keys(), 'Rules': matches.values()}))
+
+    def get_missing_texts(self, texts: pd.Index) -> list[str]:
+        return [
+            text
+            for text in texts
+            if isinstance(text, str) and any(text not in matches for matches in self.matches)
+        ]
+
+    def use(self, texts: pd.Index) -> None:
+        self.texts_in_use.update(text for text in texts if isinstance(text, str))
+
+    def update(self, new_matches: dict[str, list[int]], rule_offsets: list[int]) -> None:
+        for i, (matches, start, end) in enumerate(
+            zip(self.matches, rule_offsets[:-1], rule_offsets[1:])
+        ):
+            new: dict[str, list[int]] = {
+                text: [rule_id - start for rule_id in rule_ids if start <= rule_id < end]
+                for text, rule_ids in new_matches.items()
+                if text not in matches
+            }
+            if new:
+                matches.update(new)
+                self.changed[i] = True
+
+    def flush(self) -> None:
+        for i, (key, matches) in enumerate(zip(self.keys, self.matches)):
+            in_use: dict[str, list[int]] = {
+                text: rule_ids for text, rule_ids in matches.items() if text in self.texts_in_use
+            }
+            if self.changed[i] or len(in_use) < len(matches):
+                self.matches[i] = in_use
+                self.store(key, in_use)
+                self.changed[i] = False
+
+    def get_matches(self, text: str, rule_offsets: list[int]) -> list[int]:
+        return [
+            start + rule_id
+            for matches, start in zip(self.matches, rule_offsets)
+            for rule_id in matches[text]
+        ]
+
+
+def label_cache_key(source: str, label_config: LabelConfig) -> str:
+    return entry_key(hashlib.sha256(source.encode()).hexdigest(), rule_set_key(label_config))
+
+
+def rule_set_key(label_config: LabelConfig) -> str:
+    return hashlib.sha256(label_config.model_dump_json().encode()).hexdigest()
@@ -1,70 +1,100 @@
+from functools import cached_property
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 import pandera.pandas as pa
 from loguru import logger as log
 from pandera.typing import DataFrame, Series
+from pydantic import BaseModel
 
+from myfinances.aho_corasick import AhoCorasick, match_texts_parallel
 from myfinances.config_utils import LabelConfig, to_config
-from myfinances.parse_data import Transaction
-from myfinances.utils import get_rows_by_string
+from myfinances.label_cache import LabelCache
+from myfinances.parse_data import Transaction, has_string_categories
+from myfinances.utils import encode_text
+from myfinances.validation import check_types
+
+CONFLICT_COLUMNS: list[str] = ['Sublabel', 'Identifier', 'OtherSublabel', 'OtherIdentifier', 'Rows']
+RULE_COLUMNS: list[str] = ['Label', 'Sublabel', 'Identifier', 'IsIncome']
 
 
 class TransactionLabeled(Transaction):
-    Label: Series[str]
-    Sublabel: Series[str]
+    Label: Series[pd.CategoricalDtype]
+    Sublabel: Series[pd.CategoricalDtype]
     IsIncome: Series[bool]
+    RuleId: Series[int]
+
+    @pa.check('Label', 'Sublabel')
+    @classmethod
+    def label_categories_are_strings(cls, ser: pd.Series) -> bool:
+        return has_string_categories(ser)
 
 
-@pa.check_types
+@check_types
 def set_all_labels(
-    df: DataFrame[Transaction], label_configs: list[Path]
+    df: DataFrame[Transaction],
+    label_config_files: list[Path],
+    first_match: bool = False,
+    cache_dir: Path | None = None,
+    n_workers: int = 1,
 ) -> DataFrame[TransactionLabeled]:
-    df_with_labels: DataFrame[TransactionLabeled] = add_empty_labels_columns(df)
-    set_labels_by_config(df_with_labels, label_configs)
+    label_configs: list[LabelConfig] = load_label_configs(label_config_files)
+    df_with_labels: DataFrame[TransactionLabeled] = add_empty_labels_columns(df, label_configs)
+    set_labels_by_config(
+        df_with_labels, label_configs, first_match, cache_dir, n_workers, label_config_files
+    )
     check_for_unlabeled_transactions(df_with_labels)
 
     return df_with_labels
 
 
-def add_empty_labels_columns(df: DataFrame[Transaction]) -> DataFrame[TransactionLabeled]:
-    df = df.assign(Label=None)  # type: ignore
-    df = df.assign(Sublabel=None)  # type: ignore
+def add_empty_labels_columns(
+    df: DataFrame[Transaction], label_configs: list[LabelConfig] = []
+) -> DataFrame[TransactionLabeled]:
+    labels: list[str] = list(dict.fromkeys(config.label for config in label_configs))
+    sublabels: list[str] = list(
+        dict.fromkeys(sublabel for config in label_configs for sublabel in config.sublabels)
+    )
+    df = df.assign(Label=empty_categorical(df.shape[0], labels))  # type: ignore
+    df = df.assign(Sublabel=empty_categorical(df.shape[0], sublabels))  # type: ignore
     df = df.assign(IsIncome=False)  # type: ignore
+    df = df.assign(RuleId=np.full(df.shape[0], -1))  # type: ignore
     return df  # type: ignore
 
 
+def empty_categorical(size: int, categories: list[str]) -> pd.Categorical:
+    return pd.Categorical.from_codes(
+        np.full(size, -1), categories=pd.Index(categories, dtype=object)
+    )
+
+
 def set_labels_by_config(
-    df: DataFrame[TransactionLabeled], label_config_files: list[Path]
+    df: DataFrame[TransactionLabeled],
+    label_configs: list[LabelConfig],
+    first_match: bool = False,
+    cache_dir: Path | None = None,
+    n_workers: int = 1,
+    label_config_files: list[Path] | None = None,
 ) -> DataFrame[TransactionLabeled]:
-    for config_file in label_config_files:
-        label_config: LabelConfig = to_config(config_file, LabelConfig)
-        set_labels_this_config(df, label_config)
-
+    engine: LabelEngine = LabelEngine(
+        label_configs, first_match, cache_dir, n_workers, label_config_files
+    )
+    try:
+        engine.set_labels(df)
+    finally:
+        engine.flush_cache()
     return df
 
 
-def set_labels_this_config(df: DataFrame[TransactionLabeled], label_config: LabelConfig) -> None:
-    for sublabel, identifiers in label_config.sublabels.items():
-        check_sublabel_for_whitespace(sublabel)
-        for identifier in identifiers:
-            rows_to_label: pd.Series = get_rows_by_string(df, identifier)
-            check_for_duplicated_labels(df, rows_to_label, label_config.label, sublabel)
-            set_label(df, rows_to_label, label_config.label, sublabel, label_config.is_income)
+def load_label_configs(label_config_files: list[Path]) -> list[LabelConfig]:
+    return [to_config(config_file, LabelConfig) for config_file in label_config_files]
 
 
-def set_label(
-    df: DataFrame[TransactionLabeled],
-    rows_to_label: pd.Series,
-    label: str,
-    sublabel: str,
-    is_income: bool,
-) -> None:
-    df.loc[rows_to_label, TransactionLabeled.Label] = label
-    df.loc[rows_to_label, TransactionLabeled.Sublabel] = sublabel
-    df.loc[rows_to_label, TransactionLabeled.IsIncome] = is_income
-    log.debug(df[rows_to_label])
-    log.debug('Labled ' + str(rows_to_label.sum()) + ' entries with ' + label + '/' + sublabel)
+def add_missing_category(df: DataFrame[TransactionLabeled], column: str, value: str) -> None:
+    if isinstance(df[column].dtype, pd.CategoricalDtype) and value not in df[column].cat.categories:
+        df[column] = df[column].cat.add_categories([value])
 
 
 def check_for_duplicated_labels(
@@ -78,6 +108,19 @@ def check_for_duplicated_labels(
         raise KeyError
 
 
+def explain_label(df: DataFrame[TransactionLabeled], rule_table: pd.DataFrame, index) -> pd.Series:
+    rule_id: int = df.at[index, TransactionLabeled.RuleId]
+    if rule_id < 0:
+        raise KeyError(f'Transaction {index} is not labeled')
+    return rule_table.loc[rule_id]
+
+
+def log_label_conflicts(conflicts: pd.DataFrame) -> None:
+    if not conflicts.empty:
+        log.error(f'Found {conflicts.shape[0]} pairs of identifiers labeling the same rows:')
+        log.error(conflicts.to_string(index=False))
+
+
 def check_for_unlabeled_transactions(df) -> None:
     if df[TransactionLabeled.Label].isna().sum() > 0:
         log.error('Found unlabled transactions:')
@@ -88,3 +131,285 @@ def check_for_unlabeled_transactions(df) -> None:
 def check_sublabel_for_whitespace(key: str):
     if ' ' in key:
         raise KeyError(f'Sublabel contains whitespace: {key}')
+
+
+class LabelRule(BaseModel):
+    identifier: str
+    label: str
+    sublabel: str
+    is_income: bool
+
+
+class LabelEngine:
+    def __init__(
+        self,
+        label_configs: list[LabelConfig],
+        first_match: bool = False,
+        cache_dir: Path | None = None,
+        n_workers: int = 1,
+        label_config_files: list[Path] | None = None,
+    ) -> None:
+        self.first_match: bool = first_match
+        self.n_workers: int = n_workers
+        self.rules: list[LabelRule] = []
+        self.rule_offsets: list[int] = [0]
+        self.invalid_sublabel: tuple[int, str] | None = None
+        for label_config in label_configs:
+            for sublabel, identifiers in label_config.sublabels.items():
+                if ' ' in sublabel and self.invalid_sublabel is None:
+                    self.invalid_sublabel = (len(self.rules), sublabel)
+                self.rules += [
+                    LabelRule(
+                        identifier=identifier,
+                        label=label_config.label,
+                        sublabel=sublabel,
+                        is_income=label_config.is_income,
+                    )
+                    for identifier in identifiers
+                ]
+            self.rule_offsets.append(len(self.rules))
+        self.label_cache: LabelCache | None = None
+        if cache_dir is not None:
+            sources: list[str] = (
+                [str(file.resolve()) for file in label_config_files]
+                if label_config_files is not None
+                else [label_config.label for label_config in label_configs]
+            )
+            self.label_cache = LabelCache(cache_dir, label_configs, sources)
+
+    @cached_property
+    def automaton(self) -> AhoCorasick:
+        return AhoCorasick([rule.identifier for rule in self.rules])
+
+    def set_labels(self, df: DataFrame[TransactionLabeled]) -> DataFrame[TransactionLabeled]:
+        if self.label_cache is not None:
+            self.label_cache.use(encode_text(df)[1])
+        if self.first_match:
+            return self.set_first_labels(df)
+        codes, texts = encode_text(df)
+        matches: list[list[int]] = self.match(texts)
+        n_rules_valid: int = self.count_valid_rules(df, codes, matches)
+        first_match: np.ndarray = np.array(
+            [
+                rule_ids[0] if rule_ids and rule_ids[0] < n_rules_valid else -1
+                for rule_ids in matches
+            ]
+            + [-1],
+            dtype=int,
+        )
+        self.apply_rules(df, first_match[codes], n_rules_valid)
+
+        if n_rules_valid < len(self.rules) or self.invalid_sublabel is not None:
+            log_label_conflicts(self.count_conflicts(codes, matches))
+            self.raise_for_rule(df, codes, matches, n_rules_valid)
+        return df
+
+    def set_first_labels(self, df: DataFrame[TransactionLabeled]) -> DataFrame[TransactionLabeled]:
+        if self.invalid_sublabel is not None:
+            check_sublabel_for_whitespace(self.invalid_sublabel[1])
+        codes, texts = encode_text(df)
+        unlabeled: np.ndarray = df[TransactionLabeled.Label].isna().to_numpy() & (codes >= 0)
+        candidates: np.ndarray = np.unique(codes[unlabeled])
+        first_match: np.ndarray = np.full(len(texts) + 1, -1, dtype=int)
+        first_match[candidates] = [
+            min(rule_ids, default=-1) for rule_ids in self.match(texts[candidates])
+        ]
+        self.apply_rules(df, np.where(unlabeled, first_match[codes], -1), len(self.rules))
+        return df
+
+    def relabel(
+        self, df: DataFrame[TransactionLabeled], previous_rule_table: pd.DataFrame
+    ) -> DataFrame[TransactionLabeled]:
+        rule_table: pd.DataFrame = self.get_rule_table()
+        rule_ids: pd.Series = pd.Series(
+            rule_table.index, index=pd.MultiIndex.from_frame(rule_table[RULE_COLUMNS])
+        )
+        rule_ids = rule_ids[~rule_ids.index.duplicated()]
+        previous_keys: pd.MultiIndex = pd.MultiIndex.from_frame(previous_rule_table[RULE_COLUMNS])
+        id_map: np.ndarray = np.append(rule_ids.reindex(previous_keys, fill_value=-1), -1)
+
+        df[TransactionLabeled.RuleId] = id_map[df[TransactionLabeled.RuleId].to_numpy()]
+        stale: np.ndarray = (df[TransactionLabeled.RuleId] < 0).to_numpy()
+        is_new: np.ndarray = ~pd.MultiIndex.from_frame(rule_table[RULE_COLUMNS]).isin(previous_keys)
+        stale |= self.find_rows_matching(df, np.flatnonzero(is_new).tolist())
+        kept_rule_ids: np.ndarray = id_map[:-1][id_map[:-1] >= 0]
+        if self.first_match and np.any(np.diff(kept_rule_ids) < 0):
+            stale[:] = True
+        log.info(f'Relabeling {stale.sum()} of {df.shape[0]} transactions')
+        for rule in self.rules:
+            add_missing_category(df, TransactionLabeled.Label, rule.label)
+            add_missing_category(df, TransactionLabeled.Sublabel, rule.sublabel)
+        df.loc[stale, TransactionLabeled.Label] = np.nan
+        df.loc[stale, TransactionLabeled.Sublabel] = np.nan
+        df.loc[stale, TransactionLabeled.IsIncome] = False
+
+        if self.label_cache is not None:
+            self.label_cache.use(encode_text(df)[1])
+        df_stale: DataFrame[TransactionLabeled] = df.loc[stale]  # type: ignore
+        df_stale = df_stale.assign(
+            Text=df_stale[TransactionLabeled.Text].cat.remove_unused_categories()
+        )  # type: ignore
+        self.set_labels(df_stale)
+        label_columns: list[str] = [
+            TransactionLabeled.Label,
+            TransactionLabeled.Sublabel,
+            TransactionLabeled.IsIncome,
+            TransactionLabeled.RuleId,
+        ]
+        df.loc[stale, label_columns] = df_stale[label_columns]
+        return df
+
+    def find_rows_matching(
+        self, df: DataFrame[TransactionLabeled], rule_ids: list[int]
+    ) -> np.ndarray:
+        if not rule_ids:
+            return np.zeros(df.shape[0], dtype=bool)
+        codes, texts = encode_text(df)
+        automaton: AhoCorasick = AhoCorasick(
+            [self.rules[rule_id].identifier for rule_id in rule_ids]
+        )
+        is_match: np.ndarray = np.array(
+            [isinstance(text, str) and bool(automaton.find_all(text)) for text in texts] + [False]
+        )
+        return is_match[codes]
+
+    def get_rule_table(self, label_config_files: list[Path] | None = None) -> pd.DataFrame:
+        rule_table: pd.DataFrame = pd.DataFrame(
+            [[rule.label, rule.sublabel, rule.identifier, rule.is_income] for rule in self.rules],
+            columns=RULE_COLUMNS,
+            index=pd.RangeIndex(len(self.rules), name=TransactionLabeled.RuleId),
+        )
+        if label_config_files is not None:
+            rule_counts: np.ndarray = np.diff(self.rule_offsets)
+            rule_table.insert(
+                0, 'File', np.repeat([str(f) for f in label_config_files], rule_counts)
+            )
+        return rule_table
+
+    def find_conflicts(self, df: DataFrame[Transaction]) -> pd.DataFrame:
+        codes, texts = encode_text(df)
+        return self.count_conflicts(codes, self.match(texts))
+
+    def count_conflicts(self, codes: np.ndarray, matches: list[list[int]]) -> pd.DataFrame:
+        rows_per_text: np.ndarray = np.bincount(codes[codes >= 0], minlength=len(matches))
+        pairs: dict[tuple[int, int], int] = {}
+        for rule_ids, n_rows in zip(matches, rows_per_text):
+            if n_rows == 0:
+                continue
+            for i, rule_id in enumerate(rule_ids):
+                for other_rule_id in rule_ids[i + 1 :]:
+                    pairs[(rule_id, other_rule_id)] = (
+                        pairs.get((rule_id, other_rule_id), 0) + n_rows
+                    )
+        return pd.DataFrame(
+            [
+                [
+                    f'{self.rules[rule_id].label}/{self.rules[rule_id].sublabel}',
+                    self.rules[rule_id].identifier,
+                    f'{self.rules[other_rule_id].label}/{self.rules[other_rule_id].sublabel}',
+                    self.rules[other_rule_id].identifier,
+                    int(n_rows),
+                ]
+                for (rule_id, other_rule_id), n_rows in sorted(pairs.items())
+            ],
+            columns=CONFLICT_COLUMNS,
+        )
+
+    def match(self, texts: pd.Index) -> list[list[int]]:
+        if self.label_cache is None:
+            matches: Iterator[list[int]] = iter(
+                self.find_matches([text for text in texts if isinstance(text, str)])
+            )
+            return [next(matches) if isinstance(text, str) else [] for text in texts]
+        missing: list[str] = self.label_cache.get_missing_texts(texts)
+        if missing:
+            log.info(f'Matching {len(missing)} of {len(texts)} texts not found in label cache')
+            self.label_cache.update(
+                dict(zip(missing, self.find_matches(missing))), self.rule_offsets
+            )
+        return [
+            self.label_cache.get_matches(text, self.rule_offsets) if isinstance(text, str) else []
+            for text in texts
+        ]
+
+    def flush_cache(self) -> None:
+        if self.label_cache is not None:
+            self.label_cache.flush()
+
+    def find_matches(self, texts: list[str]) -> list[list[int]]:
+        n_configs: int = len(self.rule_offsets) - 1
+        if self.n_workers <= 1 or n_configs <= 1 or not texts:
+            return [sorted(self.automaton.find_all(text)) for text in texts]
+
+        log.info(f'Matching {n_configs} label configs with {self.n_workers} workers')
+        pattern_sets: list[list[str]] = [
+            [rule.identifier for rule in self.rules[start:end]]
+            for start, end in zip(self.rule_offsets[:-1], self.rule_offsets[1:])
+        ]
+        matches_per_config: list[list[list[int]]] = match_texts_parallel(
+            texts, pattern_sets, self.n_workers
+        )
+        return [
+            [
+                start + rule_id
+                for start, matches in zip(self.rule_offsets, matches_per_config)
+                for rule_id in matches[i]
+            ]
+            for i in range(len(texts))
+        ]
+
+    def count_valid_rules(
+        self, df: DataFrame[TransactionLabeled], codes: np.ndarray, matches: list[list[int]]
+    ) -> int:
+        in_use: np.ndarray = np.bincount(codes[codes >= 0], minlength=len(matches)) > 0
+        labeled: np.ndarray = np.bincount(
+            codes[(codes >= 0) & df[TransactionLabeled.Label].notna().to_numpy()],
+            minlength=len(matches),
+        )
+        n_rules_valid: int = len(self.rules)
+        for code, rule_ids in enumerate(matches):
+            if not in_use[code] or not rule_ids:
+                continue
+            if labeled[code] > 0:
+                n_rules_valid = min(n_rules_valid, rule_ids[0])
+            elif len(rule_ids) > 1:
+                n_rules_valid = min(n_rules_valid, rule_ids[1])
+        if self.invalid_sublabel is not None:
+            n_rules_valid = min(n_rules_valid, self.invalid_sublabel[0])
+        return n_rules_valid
+
+    def apply_rules(
+        self, df: DataFrame[TransactionLabeled], rule_ids: np.ndarray, n_rules: int
+    ) -> None:
+        labeled: np.ndarray = rule_ids >= 0
+        for column, values in (
+            (TransactionLabeled.Label, [rule.label for rule in self.rules[:n_rules]]),
+            (TransactionLabeled.Sublabel, [rule.sublabel for rule in self.rules[:n_rules]]),
+        ):
+            for value in dict.fromkeys(values):
+                add_missing_category(df, column, value)
+            df.loc[labeled, column] = np.array(values, dtype=object)[rule_ids[labeled]]
+        is_income: np.ndarray = np.array(
+            [rule.is_income for rule in self.rules[:n_rules]], dtype=bool
+        )
+        df.loc[labeled, TransactionLabeled.IsIncome] = is_income[rule_ids[labeled]]
+        df.loc[labeled, TransactionLabeled.RuleId] = rule_ids[labeled]
+
+        hits: np.ndarray = np.bincount(rule_ids[labeled], minlength=n_rules)
+        for rule, n_hits in zip(self.rules, hits):
+            if n_hits > 0:
+                log.debug(f'Labled {n_hits} entries with {rule.label}/{rule.sublabel}')
+
+    def raise_for_rule(
+        self,
+        df: DataFrame[TransactionLabeled],
+        codes: np.ndarray,
+        matches: list[list[int]],
+        rule_id: int,
+    ) -> None:
+        if self.invalid_sublabel is not None and self.invalid_sublabel[0] == rule_id:
+            check_sublabel_for_whitespace(self.invalid_sublabel[1])
+        rule: LabelRule = self.rules[rule_id]
+        is_match: np.ndarray = np.array([rule_id in rule_ids for rule_ids in matches] + [False])
+        rows_to_label: pd.Series = pd.Series(is_match[codes], index=df.index)
+        check_for_duplicated_labels(df, rows_to_label, rule.label, rule.sublabel)
@@ -14,6 +14,8 @@ from myfinances.monthly_costs import MonthlyCosts
 from myfinances.parse_arguments import get_parsed_arguments
 from myfinances.parse_data import Transaction, load_data
 from myfinances.rename_transactions import rename_transactions
+from myfinances.stream_data import get_labled_data_streaming
+from myfinances.watch import LabelWatcher
 
 pd.set_option('display.max_colwidth', None)
 log.remove(0)
@@ -24,7 +26,22 @@ def main() -> None:
     args: Namespace = get_parsed_arguments()
     configs_paths: Configs = to_config(Path(args.config), Configs)
 
-    transactions_labled: DataFrame[TransactionLabeled] = get_labled_data(configs_paths)
+    cache_dir: Path | None = None if args.no_cache else Path(args.cache_dir)
+    if args.watch:
+        LabelWatcher(Path(args.config), args.workers, cache_dir, args.first_match).run()
+        return
+    if args.chunksize:
+        transactions_labled: DataFrame[TransactionLabeled] = get_labled_data_streaming(
+            configs_paths, args.chunksize, args.first_match, cache_dir
+        )
+    else:
+        transactions_labled: DataFrame[TransactionLabeled] = get_labled_data(
+            configs_paths,
+            n_workers=args.workers,
+            cache_dir=cache_dir,
+            incremental=args.incremental,
+            first_match=args.first_match,
+        )
 
     monthly_costs: MonthlyCosts = MonthlyCosts(transactions_labled, 1)
     for drop_config in configs_paths.drop_configs:
@@ -37,8 +54,16 @@ def main() -> None:
         dashboard.run()
 
 
-def get_labled_data(configs_paths) -> DataFrame[TransactionLabeled]:
-    transactions_all: DataFrame[Transaction] = load_data(configs_paths.inputs_config)
+def get_labled_data(
+    configs_paths,
+    n_workers: int = 1,
+    cache_dir: Path | None = None,
+    incremental: bool = False,
+    first_match: bool = False,
+) -> DataFrame[TransactionLabeled]:
+    transactions_all: DataFrame[Transaction] = load_data(
+        configs_paths.inputs_config, n_workers, cache_dir, incremental
+    )
     transactions_renamed: DataFrame[Transaction] = rename_transactions(
         transactions_all, configs_paths.rename_transactions_config
     )
@@ -46,7 +71,7 @@ def get_labled_data(configs_paths) -> DataFrame[TransactionLabeled]:
         transactions_renamed, configs_paths.drop_transactions_config
     )
     transactions_labled: DataFrame[TransactionLabeled] = set_all_labels(
-        transactions_relevant, configs_paths.label_configs
+        transactions_relevant, configs_paths.label_configs, first_match, cache_dir, n_workers
     )
     return transactions_labled
 
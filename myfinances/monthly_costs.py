@@ -1,34 +1,45 @@
+import numpy as np
 import pandas as pd
 from pandera.typing import DataFrame
 
 from myfinances.label_data import TransactionLabeled
-from myfinances.monthly_transactions import MonthlyTransactions
+from myfinances.monthly_transactions import (
+    MonthlyTransactions,
+    get_month_code,
+    get_month_starts,
+    memoize,
+)
 
 
 class MonthlyCosts(MonthlyTransactions):
     def __init__(self, df: DataFrame[TransactionLabeled], month_split_day: int = 1) -> None:
         super().__init__(df, month_split_day)
 
+    @memoize
     def calculate_sum_negative_transactions(self) -> float:
         negative_transactions: DataFrame[TransactionLabeled] = self._get_negative_transactions()
         expenses: float = negative_transactions[TransactionLabeled.Amount].sum()
         return expenses
 
+    @memoize
     def calculate_sum_positive_transactions(self) -> float:
         positive_transactions: DataFrame[TransactionLabeled] = self._get_positive_transactions()
         income: float = positive_transactions[TransactionLabeled.Amount].sum()
         return income
 
+    @memoize
     def calculate_sum_expenses(self) -> float:
         expenses_transactions: DataFrame[TransactionLabeled] = self._get_expenses_transactions()
         expenses: float = expenses_transactions[TransactionLabeled.Amount].sum()
         return expenses
 
+    @memoize
     def calculate_sum_income(self) -> float:
         income_transactions: DataFrame[TransactionLabeled] = self._get_income_transactions()
         income: float = income_transactions[TransactionLabeled.Amount].sum()
         return income
 
+    @memoize
     def _get_positive_transactions(self) -> DataFrame[TransactionLabeled]:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         positive_transactions: DataFrame[TransactionLabeled] = df.loc[
@@ -36,6 +47,7 @@ class MonthlyCosts(MonthlyTransactions):
         ]
         return positive_transactions
 
+    @memoize
     def _get_negative_transactions(self) -> DataFrame[TransactionLabeled]:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         negative_transactions: DataFrame[TransactionLabeled] = df.loc[
@@ -43,11 +55,13 @@ class MonthlyCosts(MonthlyTransactions):
         ]
         return negative_transactions
 
+    @memoize
     def _get_income_transactions(self) -> DataFrame[TransactionLabeled]:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         income_transactions: DataFrame[TransactionLabeled] = df.loc[df[TransactionLabeled.IsIncome]]
         return income_transactions
 
+    @memoize
     def _get_expenses_transactions(self) -> DataFrame[TransactionLabeled]:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         expenses_transactions: DataFrame[TransactionLabeled] = df.loc[
@@ -59,7 +73,7 @@ class MonthlyCosts(MonthlyTransactions):
         self, df: DataFrame[TransactionLabeled]
     ) -> pd.api.typing.DataFrameGroupBy:
         total_grouped_expenses: pd.api.typing.DataFrameGroupBy = (
-            df.groupby([TransactionLabeled.Label])[TransactionLabeled.Amount]
+            df.groupby([TransactionLabeled.Label], observed=True)[TransactionLabeled.Amount]
             .sum()
             .div(self.get_n_months_to_analyze())
             .sort_values()
@@ -71,45 +85,59 @@ class MonthlyCosts(MonthlyTransactions):
     ) -> pd.api.typing.DataFrameGroupBy:
         total_grouped_expenses: pd.api.typing.DataFrameGroupBy = (
             df[df[TransactionLabeled.Label] == label]
-            .groupby([TransactionLabeled.Sublabel])[TransactionLabeled.Amount]
+            .groupby([TransactionLabeled.Sublabel], observed=True)[TransactionLabeled.Amount]
             .sum()
             .div(self.get_n_months_to_analyze())
             .sort_values()
         )  # type: ignore
         return total_grouped_expenses
 
+    @memoize
     def get_averaged_income_by_label(self) -> pd.api.typing.DataFrameGroupBy:
         positive_transactions: DataFrame[TransactionLabeled] = self._get_income_transactions()
         return self._sum_amount_by_label(positive_transactions)
 
+    @memoize
     def get_averaged_income_by_sublabel(self, label: str) -> pd.api.typing.DataFrameGroupBy:
         positive_transactions: DataFrame[TransactionLabeled] = self._get_income_transactions()
         return self._sum_amount_by_sublabel(positive_transactions, label)
 
+    @memoize
     def get_averaged_expenses_by_label(self) -> pd.api.typing.DataFrameGroupBy:
         df: DataFrame[TransactionLabeled] = self._get_expenses_transactions()
         return self._sum_amount_by_label(df)
 
+    @memoize
     def get_averaged_expenses_by_sublabel(self, label: str) -> pd.api.typing.DataFrameGroupBy:
         df: DataFrame[TransactionLabeled] = self._get_expenses_transactions()
         return self._sum_amount_by_sublabel(df, label)
 
+    @memoize
     def get_averaged_transactions_by_label(self) -> pd.api.typing.DataFrameGroupBy:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         return self._sum_amount_by_label(df)
 
+    @memoize
     def get_averaged_transactions_by_sublabel(self, label: str) -> pd.api.typing.DataFrameGroupBy:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         return self._sum_amount_by_sublabel(df, label)
 
+    @memoize
     def get_monthly_transactions(self, additional_labels=[]) -> pd.DataFrame:
-        monthly_expenses: list = []
         groupby_labels: list = [TransactionLabeled.Date] + additional_labels
-        for df in self.iterate_months():
-            date_income: pd.Timestamp = df[TransactionLabeled.Date].min()
-            df.loc[:, TransactionLabeled.Date] = date_income.replace(day=self._month_split_day)
-            monthly_expenses.append(df.groupby(groupby_labels).sum().reset_index())
-        return pd.concat(monthly_expenses).reset_index(drop=True)
+        positions, month_codes = self._get_months_to_analyze_rows()
+        month_starts: np.ndarray = get_month_starts(
+            month_codes + get_month_code(self._date_to_start, self._month_split_day),
+            self._month_split_day,
+        )
+        df: DataFrame[TransactionLabeled] = self._df.iloc[positions].assign(
+            **{TransactionLabeled.Date: month_starts}
+        )  # type: ignore
+        return (
+            df.groupby(groupby_labels, observed=True)[[TransactionLabeled.Amount]]
+            .sum()
+            .reset_index()
+        )
 
     def get_monthly_transactions_by_label(self, label: str) -> pd.DataFrame:
         expenses = self.get_monthly_transactions([TransactionLabeled.Label])
@@ -145,6 +173,7 @@ class MonthlyCosts(MonthlyTransactions):
         df_relative.drop(columns=[f'{TransactionLabeled.Amount}_label'], inplace=True)
         return df_relative
 
+    @memoize
     def get_daily_transactions(self) -> pd.DataFrame:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
         df_daily_expenses: pd.DataFrame = df.loc[
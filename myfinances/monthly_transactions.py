@@ -1,7 +1,11 @@
 import datetime
+import functools
+import inspect
+from collections import OrderedDict
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Generator, NamedTuple
 
+import numpy as np
 import pandas as pd
 from loguru import logger as log
 from pandera.typing import DataFrame
@@ -10,6 +14,52 @@ from myfinances.config_utils import AddLabels, DropLabels
 from myfinances.label_data import TransactionLabeled
 from myfinances.utils import get_next_day, get_next_month, get_previous_day, get_previous_month
 
+MEMO_SIZE: int = 64
+
+
+class MemoInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+def memoize(method: Callable) -> Callable:
+    """Memoize a method against the state version of its MonthlyTransactions.
+
+    Memoized results are shared between calls and must not be modified in place.
+    """
+
+    signature: inspect.Signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments: inspect.BoundArguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        key: tuple = (
+            method.__name__,
+            self._version,
+            *map(to_hashable, list(arguments.arguments.values())[1:]),
+        )
+        if key in self._memo:
+            self._memo_hits += 1
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        self._memo_misses += 1
+        result = method(self, *args, **kwargs)
+        self._memo[key] = result
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def to_hashable(value):
+    if isinstance(value, list):
+        return tuple(to_hashable(item) for item in value)
+    return value
+
+
 # class TransactionsInterface(ABC):
 # class TransactionsInterface(ABC):
 #    @property
@@ -202,8 +252,11 @@ from myfinances.utils import get_next_day, get_next_month, get_previous_day, get
 
 class MonthlyTransactions:
     def __init__(self, df: DataFrame[TransactionLabeled], month_split_day: int = 1) -> None:
-        self._set_all_transactions(df)
-        self._mask: pd.Series = pd.Series([True] * df.shape[0])
+        self._version: int = 0
+        self._memo: OrderedDict[tuple, object] = OrderedDict()
+        self._memo_hits: int = 0
+        self._memo_misses: int = 0
+        self._set_all_transactions(df, pd.Series([True] * df.shape[0]))
         self.set_month_split_day(month_split_day)
         self.reset_start_end_dates()
 
@@ -223,6 +276,7 @@ class MonthlyTransactions:
     ) -> None:
         valid_start_date: pd.Timestamp = self.get_date_to_start()
         valid_end_date: pd.Timestamp = self.get_date_to_end()
+        self._bump_version()
         try:
             self._date_to_start = date_to_start
             self._date_to_end = date_to_end
@@ -235,28 +289,33 @@ class MonthlyTransactions:
     def set_month_split_day(self, month_split_day: int) -> None:
         MonthSplitDateValidityChecker().execute(month_split_day)
         self._month_split_day: int = month_split_day
+        self._bump_version()
         self.reset_start_end_dates()
 
     def reset_start_end_dates(self) -> None:
         self._reset_start_end_dates()
         DateValidityChecker(self).execute()
 
+    def get_memo_info(self) -> MemoInfo:
+        return MemoInfo(self._memo_hits, self._memo_misses, len(self._memo))
+
+    def _bump_version(self) -> None:
+        self._version += 1
+        self._memo.clear()
+
+    @memoize
     def get_transactions(self) -> DataFrame[TransactionLabeled]:
-        return self._df.loc[
-            (
-                (self._df[TransactionLabeled.Date] >= self._date_to_start)
-                & (self._df[TransactionLabeled.Date] <= self._date_to_end)
-                & self._mask
-            )
-        ]
+        in_dates: slice = self._get_dates_slice()
+        return self._df.iloc[in_dates].loc[self._mask.iloc[in_dates].to_numpy(dtype=bool)]
 
+    @memoize
     def get_all_transactions_in_dates(self) -> DataFrame[TransactionLabeled]:
-        return self._df.loc[
-            (
-                (self._df[TransactionLabeled.Date] >= self._date_to_start)
-                & (self._df[TransactionLabeled.Date] <= self._date_to_end)
-            )
-        ]
+        return self._df.iloc[self._get_dates_slice()].copy()
+
+    def _get_dates_slice(self) -> slice:
+        start: int = int(np.searchsorted(self._dates, self._date_to_start.to_datetime64(), 'left'))
+        end: int = int(np.searchsorted(self._dates, self._date_to_end.to_datetime64(), 'right'))
+        return slice(start, end)
 
     def get_date_to_start(self) -> pd.Timestamp:
         return self._date_to_start
@@ -274,56 +333,76 @@ class MonthlyTransactions:
         return self._max_date_to_end
 
     def get_all_months_to_analyze_start(self) -> list[pd.Timestamp]:
-        return self._calculate_months_to_analyze_start(
-            self._min_date_to_start, self._max_date_to_end
-        )
+        months_start, _ = self._get_month_boundaries(self._min_date_to_start, self._max_date_to_end)
+        return to_timestamps(months_start)
 
+    @memoize
     def get_months_to_analyze_start(self) -> list[pd.Timestamp]:
-        return self._calculate_months_to_analyze_start(self._date_to_start, self._date_to_end)
-
-    def _calculate_months_to_analyze_start(
-        self, date_to_start: pd.Timestamp, date_to_end: pd.Timestamp
-    ) -> list[pd.Timestamp]:
-        months_to_analyze_start: list[pd.Timestamp] = []
-        month: pd.Timestamp = date_to_start
-        while month <= date_to_end:
-            months_to_analyze_start.append(month)
-            month: pd.Timestamp = get_next_month(month)
-        return months_to_analyze_start
+        months_start, _ = self._get_month_boundaries(self._date_to_start, self._date_to_end)
+        return to_timestamps(months_start)
 
     def get_all_months_to_analyze_end(self) -> list[pd.Timestamp]:
-        return self._get_months_to_analyze_end(self.get_all_months_to_analyze_start())
+        _, months_end = self._get_month_boundaries(self._min_date_to_start, self._max_date_to_end)
+        return to_timestamps(months_end)
 
     def get_months_to_analyze_end(self) -> list[pd.Timestamp]:
-        return self._get_months_to_analyze_end(self.get_months_to_analyze_start())
+        _, months_end = self._get_month_boundaries(self._date_to_start, self._date_to_end)
+        return to_timestamps(months_end)
 
-    def _get_months_to_analyze_end(
-        self, months_to_analyze_start: list[pd.Timestamp]
-    ) -> list[pd.Timestamp]:
-        months: list[pd.Timestamp] = [
-            get_previous_day(month) for month in months_to_analyze_start[1:]
-        ]
-        months.append(get_previous_day(get_next_month(months_to_analyze_start[-1])))
-        return months
+    def _get_month_boundaries(
+        self, date_to_start: pd.Timestamp, date_to_end: pd.Timestamp
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return get_month_boundaries(date_to_start, date_to_end, self._month_split_day)
 
     def get_n_months_to_analyze(self) -> int:
-        return len(self.get_months_to_analyze_start())
+        months_start, _ = self._get_month_boundaries(self._date_to_start, self._date_to_end)
+        return len(months_start)
 
     def iterate_months(self) -> Generator:
-        months_to_analyze_start: list[pd.Timestamp] = self.get_months_to_analyze_start()
-        months_to_analyze_end: list[pd.Timestamp] = self.get_months_to_analyze_end()
-        df: DataFrame[TransactionLabeled] = self.get_transactions()
-        for start, end in zip(months_to_analyze_start, months_to_analyze_end):
-            month_dates: DataFrame[TransactionLabeled] = df.loc[
-                (df[TransactionLabeled.Date] >= start) & (df[TransactionLabeled.Date] <= end)
-            ]
+        positions, month_codes = self._get_months_to_analyze_rows()
+        bounds: np.ndarray = np.searchsorted(
+            month_codes, np.arange(self.get_n_months_to_analyze() + 1)
+        )
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            month_dates: DataFrame[TransactionLabeled] = self._df.iloc[positions[start:end]]
             yield month_dates
 
-    def _set_all_transactions(self, df: DataFrame[TransactionLabeled]) -> None:
-        self._df: DataFrame[TransactionLabeled] = df
-        self._df = self._df.reset_index(drop=True)  # type: ignore
+    def _get_months_to_analyze_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        in_dates: slice = self._get_dates_slice()
+        positions: np.ndarray = in_dates.start + np.flatnonzero(
+            self._mask.iloc[in_dates].to_numpy(dtype=bool)
+        )
+        month_codes: np.ndarray = self._get_month_codes()[positions] - get_month_code(
+            self._date_to_start, self._month_split_day
+        )
+        return positions, month_codes
+
+    def _get_month_codes(self) -> np.ndarray:
+        if self._month_codes_split_day != self._month_split_day:
+            self._month_codes: np.ndarray = get_month_codes(
+                self._df[TransactionLabeled.Date], self._month_split_day
+            )
+            self._month_codes_split_day: int | None = self._month_split_day
+        return self._month_codes
+
+    def _get_pair_codes(self) -> tuple[np.ndarray, pd.MultiIndex]:
+        if self._pair_codes is None:
+            self._pair_codes, self._pairs = pd.MultiIndex.from_arrays(
+                [self._df[TransactionLabeled.Label], self._df[TransactionLabeled.Sublabel]]
+            ).factorize(use_na_sentinel=False)
+        return self._pair_codes, self._pairs
+
+    def _set_all_transactions(self, df: DataFrame[TransactionLabeled], mask: pd.Series) -> None:
+        order: np.ndarray = np.argsort(df[TransactionLabeled.Date].to_numpy(), kind='stable')
+        self._df: DataFrame[TransactionLabeled] = df.iloc[order].reset_index(drop=True)  # type: ignore
+        self._mask: pd.Series = mask.iloc[order].reset_index(drop=True)
+        self._bump_version()
+        self._dates: np.ndarray = self._df[TransactionLabeled.Date].to_numpy(dtype='datetime64[ns]')
+        self._month_codes_split_day: int | None = None
+        self._pair_codes: np.ndarray | None = None
 
     def _reset_start_end_dates(self) -> None:
+        self._bump_version()
         self._date_to_start: pd.Timestamp = self._min_day_to_start()
         self._date_to_end: pd.Timestamp = self._max_day_to_end()
         self._min_date_to_start: pd.Timestamp = self._min_day_to_start()
@@ -372,6 +451,7 @@ class MonthlyTransactions:
             raise KeyError
         else:
             self._mask: pd.Series = self._mask & ~to_drop
+            self._bump_version()
 
     def drop_costs_by_config(self, file_name: Path) -> None:
         drop_labels = DropLabels(file_name)
@@ -388,17 +468,24 @@ class MonthlyTransactions:
             df_to_add[TransactionLabeled.Text] = 'Zukunft'
             all_dfs_to_add.append(df_to_add)
         df_to_add_all_configs: DataFrame[TransactionLabeled] = pd.concat(all_dfs_to_add)  # type:ignore
+        categorical_columns: list[str] = [
+            column
+            for column, dtype in self._df.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype)
+        ]
         _df: DataFrame[TransactionLabeled] = pd.concat(
             [self._df, df_to_add_all_configs], ignore_index=True
-        )  # type: ignore
-        self._set_all_transactions(_df)
-        self._mask: pd.Series = pd.concat(
+        ).astype({column: 'category' for column in categorical_columns})  # type: ignore
+        if TransactionLabeled.RuleId in _df.columns:
+            _df[TransactionLabeled.RuleId] = _df[TransactionLabeled.RuleId].fillna(-1).astype(int)
+        mask: pd.Series = pd.concat(
             [
                 self._mask,
                 pd.Series([True] * df_to_add_all_configs.shape[0]),
             ],
             ignore_index=True,
         )
+        self._set_all_transactions(_df, mask)
         self._reset_start_end_dates()
 
     def get_all_labels(self) -> list[str]:
@@ -409,6 +496,7 @@ class MonthlyTransactions:
 
     def set_active_labels(self, values: list[str]) -> None:
         self._mask: pd.Series = self._df.loc[:, TransactionLabeled.Label].isin(values)
+        self._bump_version()
 
     def get_all_sublabels(self) -> dict:
         all_labels = self.get_all_labels()
@@ -416,32 +504,75 @@ class MonthlyTransactions:
         for label in all_labels:
             sublabels = self._df.loc[
                 self._df[TransactionLabeled.Label] == label, TransactionLabeled.Sublabel
-            ].unique()
-            all_sublabels[label] = sublabels
+            ]
+            all_sublabels[label] = unique_values(sublabels)
         return all_sublabels
 
     def get_all_sublabels_within_dates(self, label: str) -> list[str]:
         df: DataFrame[TransactionLabeled] = self.get_all_transactions_in_dates()
-        sublabels = df.loc[
-            df[TransactionLabeled.Label] == label, TransactionLabeled.Sublabel
-        ].unique()
-        return sublabels
+        sublabels = df.loc[df[TransactionLabeled.Label] == label, TransactionLabeled.Sublabel]
+        return unique_values(sublabels)
 
     def get_active_sublabels(self, label: str) -> list[str]:
         df: DataFrame[TransactionLabeled] = self.get_transactions()
-        sublabels = df.loc[
-            df[TransactionLabeled.Label] == label, TransactionLabeled.Sublabel
-        ].unique()
-        return sublabels
+        sublabels = df.loc[df[TransactionLabeled.Label] == label, TransactionLabeled.Sublabel]
+        return unique_values(sublabels)
 
     def set_active_sublabels(self, sublabels: dict[str, list[str]]) -> None:
-        mask: pd.Series = pd.Series([False] * self._df.shape[0])
-        for active_label, active_sublabels in sublabels.items():
-            mask += (self._df.loc[:, TransactionLabeled.Label] == active_label) & (
-                self._df.loc[:, TransactionLabeled.Sublabel].isin(active_sublabels)
-            )
+        pair_codes, pairs = self._get_pair_codes()
+        active_pairs: np.ndarray = pairs.get_indexer(
+            [
+                (active_label, active_sublabel)
+                for active_label, active_sublabels in sublabels.items()
+                for active_sublabel in active_sublabels
+            ]
+        )
+        is_active: np.ndarray = np.zeros(len(pairs), dtype=bool)
+        is_active[active_pairs[active_pairs >= 0]] = True
+
+        self._mask = pd.Series(is_active[pair_codes])
+        self._bump_version()
+
+
+def unique_values(ser: pd.Series) -> np.ndarray:
+    return np.asarray(ser.unique())
+
+
+def get_month_codes(dates: pd.Series, month_split_day: int) -> np.ndarray:
+    months: np.ndarray = (dates.dt.year.to_numpy() - 1970) * 12 + dates.dt.month.to_numpy() - 1
+    return months - (dates.dt.day.to_numpy() < month_split_day)
+
+
+def get_month_code(date: pd.Timestamp, month_split_day: int) -> int:
+    return (date.year - 1970) * 12 + date.month - 1 - (date.day < month_split_day)
+
+
+def get_month_starts(month_codes: np.ndarray, month_split_day: int) -> np.ndarray:
+    month_starts: np.ndarray = month_codes.astype('datetime64[M]') + np.timedelta64(
+        month_split_day - 1, 'D'
+    )
+    return month_starts.astype('datetime64[ns]')
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def get_month_boundaries(
+    date_to_start: pd.Timestamp, date_to_end: pd.Timestamp, month_split_day: int
+) -> tuple[np.ndarray, np.ndarray]:
+    month_codes: np.ndarray = np.arange(
+        get_month_code(date_to_start, month_split_day),
+        get_month_code(date_to_end, month_split_day) + 1,
+    )
+    months_start: np.ndarray = get_month_starts(month_codes, month_split_day)
+    months_end: np.ndarray = get_month_starts(month_codes + 1, month_split_day) - np.timedelta64(
+        1, 'D'
+    )
+    months_start.flags.writeable = False
+    months_end.flags.writeable = False
+    return months_start, months_end
+
 
-        self._mask = mask
+def to_timestamps(dates: np.ndarray) -> list[pd.Timestamp]:
+    return pd.DatetimeIndex(dates).tolist()
 
 
 class DateError(Exception):
@@ -3,10 +3,13 @@ from argparse import ArgumentParser, Namespace
 
 from loguru import logger as log
 
+from myfinances.validation import ValidationLevel, set_validation_level
+
 
 def get_parsed_arguments() -> Namespace:
     args: Namespace = parse_arguments()
     set_logging(args)
+    set_validation(args)
     return args
 
 
@@ -36,6 +39,46 @@ def parse_arguments() -> Namespace:
         '--dashboard',
         action='store_true',
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        required=False,
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--cache-dir',
+        required=False,
+        type=str,
+        default='.myfinances_cache',
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--chunksize',
+        required=False,
+        type=int,
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--first-match',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--validation',
+        required=False,
+        type=str,
+        choices=[level.value for level in ValidationLevel],
+    )
     args: Namespace = parser.parse_args()
     return args
 
@@ -43,3 +86,8 @@ def parse_arguments() -> Namespace:
 def set_logging(args: Namespace) -> None:
     log.remove()
     log.add(sys.stderr, level=args.log_level)
+
+
+def set_validation(args: Namespace) -> None:
+    if args.validation is not None:
+        set_validation_level(args.validation)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger as log
+from pydantic import BaseModel, ValidationError
+
+from myfinances.config_utils import InputConfig
+
+CACHE_SUFFIX: str = '.parquet'
+STATE_SUFFIX: str = '.json'
+CHUNK_SIZE: int = 1 << 20
+KEY_SEPARATOR: str = '-'
+MANIFEST_FILE: str = 'manifest'
+
+
+class FileState(BaseModel):
+    offset: int
+    rows: int
+    prefix_hash: str
+    key: str
+
+    def is_prefix_of(self, file: Path) -> bool:
+        if file.stat().st_size < self.offset:
+            return False
+        return hash_file(file, self.offset) == self.prefix_hash
+
+
+class ParseCache:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir: Path = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        cache_file: Path = self._path(key)
+        if not cache_file.is_file():
+            return None
+        try:
+            df: pd.DataFrame = pd.read_parquet(cache_file)
+        except Exception as e:
+            log.warning(f'Ignoring unreadable cache entry {cache_file.name}: {e}')
+            return None
+        log.debug(f'Loaded {cache_file.name} from cache')
+        return df
+
+    def store(self, key: str, df: pd.DataFrame) -> None:
+        cache_file: Path = self._path(key)
+        tmp_file: Path = cache_file.with_suffix('.tmp')
+        df.to_parquet(tmp_file)
+        tmp_file.replace(cache_file)
+
+    def load_state(self, key: str) -> FileState | None:
+        state_file: Path = self._path(key, STATE_SUFFIX)
+        if not state_file.is_file():
+            return None
+        try:
+            state: FileState = FileState.model_validate_json(state_file.read_text())
+        except ValidationError as e:
+            log.warning(f'Ignoring invalid file state {state_file.name}: {e}')
+            return None
+        return state
+
+    def store_state(self, key: str, state: FileState) -> None:
+        state_file: Path = self._path(key, STATE_SUFFIX)
+        tmp_file: Path = state_file.with_suffix('.tmp')
+        tmp_file.write_text(state.model_dump_json())
+        tmp_file.replace(state_file)
+
+    def evict(self, keys_in_use: list[str], sources_by_owner: dict[str, list[str]]) -> None:
+        # An entry is stale if a key in use supersedes it or if no existing configuration file
+        # references its source. Configurations sharing the cache directory keep their entries.
+        manifest: dict[str, list[str]] = self.load_manifest() | sources_by_owner
+        manifest = {owner: sources for owner, sources in manifest.items() if Path(owner).is_file()}
+        self.store_manifest(manifest)
+        referenced: set[str] = {source for sources in manifest.values() for source in sources}
+        superseded: set[str] = {source_of(key) for key in keys_in_use}
+        for suffix in (CACHE_SUFFIX, STATE_SUFFIX):
+            for cache_file in self.cache_dir.glob(f'*{suffix}'):
+                key: str = cache_file.stem
+                if key in keys_in_use:
+                    continue
+                if source_of(key) in superseded or source_of(key) not in referenced:
+                    log.debug(f'Evicting stale cache entry {cache_file.name}')
+                    cache_file.unlink()
+
+    def load_manifest(self) -> dict[str, list[str]]:
+        manifest_file: Path = self.cache_dir / MANIFEST_FILE
+        if not manifest_file.is_file():
+            return {}
+        try:
+            manifest: dict[str, list[str]] = json.loads(manifest_file.read_text())
+        except json.JSONDecodeError as e:
+            log.warning(f'Ignoring invalid cache manifest {manifest_file.name}: {e}')
+            return {}
+        return manifest
+
+    def store_manifest(self, manifest: dict[str, list[str]]) -> None:
+        manifest_file: Path = self.cache_dir / MANIFEST_FILE
+        tmp_file: Path = manifest_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(manifest, sort_keys=True))
+        tmp_file.replace(manifest_file)
+
+    def _path(self, key: str, suffix: str = CACHE_SUFFIX) -> Path:
+        return self.cache_dir / f'{key}{suffix}'
+
+
+def cache_key(file: Path, input_config: InputConfig) -> str:
+    return entry_key(state_key(file, input_config), hash_file(file))
+
+
+def state_key(file: Path, input_config: InputConfig) -> str:
+    key = hashlib.sha256()
+    key.update(_parse_options(input_config))
+    key.update(str(file.resolve()).encode())
+    return key.hexdigest()
+
+
+def entry_key(source: str, content: str) -> str:
+    return f'{source}{KEY_SEPARATOR}{content}'
+
+
+def source_of(key: str) -> str:
+    return key.partition(KEY_SEPARATOR)[0]
+
+
+def file_state(file: Path, key: str, rows: int) -> FileState | None:
+    offset: int = file.stat().st_size
+    with open(file, 'rb') as f:
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                log.debug(f'{file.name} does not end with a complete row')
+                return None
+    return FileState(offset=offset, rows=rows, prefix_hash=hash_file(file), key=key)
+
+
+def hash_file(file: Path, n_bytes: int | None = None) -> str:
+    file_hash = hashlib.sha256()
+    remaining: int | None = n_bytes
+    with open(file, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)):
+            file_hash.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return file_hash.hexdigest()
+
+
+def _parse_options(input_config: InputConfig) -> bytes:
+    parse_options: dict = input_config.model_dump(exclude={'Files'})
+    return json.dumps(parse_options, sort_keys=True).encode()
@@ -1,72 +1,402 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 import pandera.pandas as pa
+import pyarrow
 from loguru import logger as log
 from pandera.typing import DataFrame, Series
+from pyarrow import csv as arrow_csv
 
 from myfinances.config_utils import InputConfig, to_config
+from myfinances.fingerprint import (
+    ROW_HASH,
+    add_fingerprints,
+    find_overlapping_rows,
+    pop_fingerprints,
+)
+from myfinances.parse_cache import FileState, ParseCache, cache_key, file_state, state_key
+from myfinances.validation import check_types
 
 
 class Transaction(pa.DataFrameModel):
     Date: Series[pd.Timestamp]
-    Text: Series[str]
+    Text: Series[pd.CategoricalDtype]
     Amount: Series[float]
-    Account: Series[str]
+    Account: Series[pd.CategoricalDtype]
 
+    @pa.check('Text', 'Account')
+    @classmethod
+    def text_categories_are_strings(cls, ser: pd.Series) -> bool:
+        return has_string_categories(ser)
 
-@pa.check_types
-def load_data(inputs_config: Path) -> DataFrame[Transaction]:
+
+def has_string_categories(ser: pd.Series) -> bool:
+    return pd.api.types.is_string_dtype(ser.cat.categories)
+
+
+@check_types
+def load_data(
+    inputs_config: Path,
+    n_workers: int = 1,
+    cache_dir: Path | None = None,
+    incremental: bool = False,
+) -> DataFrame[Transaction]:
     inputs: list[InputConfig] = to_config(inputs_config, list[InputConfig])
-    dfs: list[DataFrame[Transaction]] = []
-    for input_config in inputs:
-        for file in input_config.Files:
-            df_raw: pd.DataFrame = load_generic(file, input_config.Delimiter, input_config.Decimal)
-            date: pd.Series = parse_dates(df_raw, input_config.DateKey, input_config.DateFormat)
-            text: pd.Series = parse_text(df_raw, input_config.TextKeys)
-            amount: pd.Series = parse_amount(df_raw, input_config.AmountKey, input_config.Decimal)
-            df: DataFrame[Transaction] = pd.DataFrame(
-                {
-                    Transaction.Date: date,
-                    Transaction.Text: text,
-                    Transaction.Amount: amount,
-                    Transaction.Account: input_config.Account,
-                }
-            )  # type: ignore
-            dfs.append(df)
+    jobs: list[tuple[Path, InputConfig]] = [
+        (file, input_config) for input_config in inputs for file in input_config.Files
+    ]
+    if cache_dir is None:
+        dfs: list[DataFrame[Transaction]] = parse_files(jobs, n_workers)
+    else:
+        dfs: list[DataFrame[Transaction]] = parse_files_cached(
+            jobs, n_workers, cache_dir, incremental, inputs_config
+        )
 
+    fingerprints: list[np.ndarray] = [pop_fingerprints(df) for df in dfs]
     df: DataFrame[Transaction] = pd.concat(dfs)  # type: ignore
+    df = drop_overlapping_rows(df, fingerprints)
+    df[Transaction.Text] = df[Transaction.Text].astype('category')
+    df[Transaction.Account] = df[Transaction.Account].astype('category')
+
+    return df
+
+
+def drop_overlapping_rows(
+    df: DataFrame[Transaction], fingerprints: list[np.ndarray]
+) -> DataFrame[Transaction]:
+    overlapping: np.ndarray = find_overlapping_rows(fingerprints)
+    if overlapping.any():
+        log.info(f'Dropping {overlapping.sum()} rows found in overlapping input files')
+    return df.loc[~overlapping]  # type: ignore
+
+
+def parse_files(
+    jobs: list[tuple[Path, InputConfig]], n_workers: int = 1
+) -> list[DataFrame[Transaction]]:
+    if n_workers <= 1 or len(jobs) <= 1:
+        return [parse_file(file, input_config) for file, input_config in jobs]
+
+    log.info(f'Parsing {len(jobs)} files with {n_workers} workers')
+    files, input_configs = zip(*jobs)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        dfs: list[DataFrame[Transaction]] = list(executor.map(parse_file, files, input_configs))
+    return dfs
+
+
+def parse_files_cached(
+    jobs: list[tuple[Path, InputConfig]],
+    n_workers: int,
+    cache_dir: Path,
+    incremental: bool,
+    inputs_config: Path,
+) -> list[DataFrame[Transaction]]:
+    cache: ParseCache = ParseCache(cache_dir)
+    keys: list[str] = [cache_key(file, input_config) for file, input_config in jobs]
+    dfs: list[DataFrame[Transaction] | None] = [
+        load_cached(cache, key, input_config) for key, (_, input_config) in zip(keys, jobs)
+    ]
+
+    state_keys: list[str] = [state_key(file, input_config) for file, input_config in jobs]
+    if incremental:
+        for i, df in enumerate(dfs):
+            if df is None:
+                dfs[i] = parse_appended_rows(cache, state_keys[i], *jobs[i])
+                if dfs[i] is not None:
+                    cache.store(keys[i], dfs[i])  # type: ignore
+
+    outdated: list[int] = [i for i, df in enumerate(dfs) if df is None]
+    log.info(f'Found {len(jobs) - len(outdated)} of {len(jobs)} input files in cache')
+    parsed: list[DataFrame[Transaction]] = parse_files([jobs[i] for i in outdated], n_workers)
+    for i, df in zip(outdated, parsed):
+        dfs[i] = add_fingerprints(df)  # type: ignore
+        cache.store(keys[i], dfs[i])  # type: ignore
 
+    if incremental:
+        for i, key in enumerate(state_keys):
+            update_file_state(cache, key, jobs[i][0], keys[i], dfs[i].shape[0])  # type: ignore
+
+    # File states of a previous incremental run stay usable together with the rows they describe.
+    states: list[FileState | None] = [cache.load_state(key) for key in state_keys]
+    cache.evict(
+        keys + state_keys + [state.key for state in states if state is not None],
+        {str(inputs_config.resolve()): state_keys},
+    )
+    return dfs  # type: ignore
+
+
+def parse_appended_rows(
+    cache: ParseCache, key: str, file: Path, input_config: InputConfig
+) -> DataFrame[Transaction] | None:
+    state: FileState | None = cache.load_state(key)
+    if state is None:
+        return None
+    df_known: DataFrame[Transaction] | None = load_cached(cache, state.key, input_config)
+    if df_known is None or not state.is_prefix_of(file):
+        log.info(f'{file.name} was rewritten, parsing it completely')
+        return None
+    if file.stat().st_size == state.offset:
+        return df_known
+
+    log.info(f'Parsing rows appended to {file.name}')
+    if ROW_HASH not in df_known.columns:
+        df_known = add_fingerprints(df_known)  # type: ignore
+    df_appended: DataFrame[Transaction] = parse_file(file, input_config, state.offset, state.rows)
+    df_appended = add_fingerprints(df_appended, df_known)  # type: ignore
+    df: DataFrame[Transaction] = pd.concat([df_known, df_appended])  # type: ignore
+    return df
+
+
+def load_cached(
+    cache: ParseCache, key: str, input_config: InputConfig
+) -> DataFrame[Transaction] | None:
+    df: DataFrame[Transaction] | None = cache.load(key)  # type: ignore
+    if df is not None and input_config.DtypeBackend == 'pyarrow':
+        df[Transaction.Text] = df[Transaction.Text].astype(pd.ArrowDtype(pyarrow.string()))
     return df
 
 
-def load_generic(file_name: Path, delimiter: str, decimal: str) -> pd.DataFrame:
+def update_file_state(cache: ParseCache, key: str, file: Path, frame_key: str, rows: int) -> None:
+    state: FileState | None = cache.load_state(key)
+    if state is not None and state.key == frame_key:
+        return
+    state = file_state(file, frame_key, rows)
+    if state is not None:
+        cache.store_state(key, state)
+
+
+def parse_file(
+    file: Path, input_config: InputConfig, offset: int = 0, first_row: int = 0
+) -> DataFrame[Transaction]:
+    if input_config.Engine == 'pyarrow':
+        df_raw: pd.DataFrame = load_arrow(
+            file,
+            input_config.Delimiter,
+            input_config.Decimal,
+            offset,
+            get_string_keys(input_config),
+            input_config.UseThreads,
+            input_config.MemoryMap,
+            input_config.DtypeBackend,
+        )
+    else:
+        df_raw: pd.DataFrame = load_generic(
+            file,
+            input_config.Delimiter,
+            input_config.Decimal,
+            offset,
+            get_thousands_separator(input_config),
+            get_string_keys(input_config),
+            **get_pandas_options(input_config),
+        )
+    df_raw.index += first_row
+    return parse_raw(df_raw, input_config, file.name)
+
+
+def parse_file_chunks(
+    file: Path, input_config: InputConfig, chunksize: int
+) -> Iterator[DataFrame[Transaction]]:
+    log.info(f'Loading {file.name} in chunks of {chunksize} rows')
+    with pd.read_csv(
+        file,
+        chunksize=chunksize,
+        **csv_options(
+            input_config.Delimiter,
+            input_config.Decimal,
+            get_thousands_separator(input_config),
+            get_string_keys(input_config),
+            input_config.DtypeBackend,
+        ),
+        **get_pandas_options(input_config, chunked=True),
+    ) as reader:
+        for df_raw in reader:
+            yield parse_raw(df_raw, input_config, file.name)
+
+
+def parse_raw(
+    df_raw: pd.DataFrame, input_config: InputConfig, file_name: str
+) -> DataFrame[Transaction]:
+    date: pd.Series = parse_dates(df_raw, input_config.DateKey, input_config.DateFormat)
+    text: pd.Series = parse_text(df_raw, input_config.TextKeys)
+    amount: pd.Series = parse_amount(
+        df_raw,
+        input_config.AmountKey,
+        input_config.Decimal,
+        get_thousands_separator(input_config),
+        file_name,
+    )
+    df: DataFrame[Transaction] = pd.DataFrame(
+        {
+            Transaction.Date: date,
+            Transaction.Text: text,
+            Transaction.Amount: amount,
+            Transaction.Account: input_config.Account,
+        }
+    )  # type: ignore
+    return df
+
+
+def get_thousands_separator(input_config: InputConfig) -> str:
+    if input_config.Thousands is not None:
+        return input_config.Thousands
+    return '.' if input_config.Decimal == ',' else ','
+
+
+def get_string_keys(input_config: InputConfig) -> list[str]:
+    string_keys: list[str] = [input_config.DateKey] + input_config.TextKeys
+    if input_config.Engine == 'python':
+        # The python engine swaps the decimal separator of amounts it cannot parse as numbers.
+        string_keys.append(input_config.AmountKey)
+    return string_keys
+
+
+def get_pandas_options(input_config: InputConfig, chunked: bool = False) -> dict:
+    options: dict = {}
+    if input_config.DtypeBackend == 'pyarrow':
+        options['dtype_backend'] = 'pyarrow'
+    if chunked:
+        return options
+    options['engine'] = input_config.Engine
+    options['memory_map'] = input_config.MemoryMap
+    return options
+
+
+def load_generic(
+    file_name: Path,
+    delimiter: str,
+    decimal: str,
+    offset: int = 0,
+    thousands: str | None = None,
+    string_keys: list[str] = [],
+    **read_options,
+) -> pd.DataFrame:
     log.info(f'Loading {file_name.name}')
     df: pd.DataFrame = pd.read_csv(
-        file_name,
-        delimiter=delimiter,
-        decimal=decimal,
-        encoding='iso-8859-1',
+        file_name if offset == 0 else read_appended_bytes(file_name, offset),
+        **csv_options(
+            delimiter, decimal, thousands, string_keys, read_options.get('dtype_backend', 'numpy')
+        ),
+        **read_options,
     )
-    df.dropna(axis=1, how='all', inplace=True)
+    if offset == 0:
+        df.dropna(axis=1, how='all', inplace=True)
     return df
 
 
-def parse_amount(df: pd.DataFrame, amount_key: str, decimal: str) -> pd.Series:
+def load_arrow(
+    file_name: Path,
+    delimiter: str,
+    decimal: str,
+    offset: int = 0,
+    string_keys: list[str] = [],
+    use_threads: bool = True,
+    memory_map: bool = False,
+    dtype_backend: str = 'pyarrow',
+) -> pd.DataFrame:
+    log.info(f'Loading {file_name.name} with pyarrow')
+    if offset > 0:
+        source = pyarrow.BufferReader(read_appended_bytes(file_name, offset).getvalue())
+    elif memory_map:
+        source = pyarrow.memory_map(str(file_name))
+    else:
+        source = pyarrow.OSFile(str(file_name))
+    with source:
+        table: pyarrow.Table = arrow_csv.read_csv(
+            source,
+            read_options=arrow_csv.ReadOptions(use_threads=use_threads, encoding='iso-8859-1'),
+            parse_options=arrow_csv.ParseOptions(delimiter=delimiter),
+            convert_options=arrow_csv.ConvertOptions(
+                decimal_point=decimal,
+                column_types={key: pyarrow.string() for key in string_keys},
+                strings_can_be_null=True,
+            ),
+        )
+    df: pd.DataFrame = table.to_pandas(
+        types_mapper=pd.ArrowDtype if dtype_backend == 'pyarrow' else None
+    )
+    if offset == 0:
+        df.dropna(axis=1, how='all', inplace=True)
+    return df
+
+
+def csv_options(
+    delimiter: str,
+    decimal: str,
+    thousands: str | None,
+    string_keys: list[str],
+    dtype_backend: str = 'numpy',
+) -> dict:
+    string_dtype = pd.ArrowDtype(pyarrow.string()) if dtype_backend == 'pyarrow' else str
+    return {
+        'delimiter': delimiter,
+        'decimal': decimal,
+        'thousands': thousands if thousands != delimiter else None,
+        'dtype': {key: string_dtype for key in string_keys},
+        'encoding': 'iso-8859-1',
+    }
+
+
+def read_appended_bytes(file_name: Path, offset: int) -> io.BytesIO:
+    with open(file_name, 'rb') as f:
+        header: bytes = f.readline()
+        f.seek(offset)
+        appended: bytes = f.read()
+    return io.BytesIO(header + appended)
+
+
+def parse_amount(
+    df: pd.DataFrame,
+    amount_key: str,
+    decimal: str,
+    thousands: str = '.',
+    file_name: str = '',
+) -> pd.Series:
     amount: pd.Series = df.loc[:, amount_key]
-    if amount.dtype != float:
-        amount: pd.Series = amount.str.replace('.', '')
-        amount: pd.Series = amount.str.replace(decimal, '.')
-        amount: pd.Series = amount.astype(float)
+    if not pd.api.types.is_numeric_dtype(amount):
+        amount: pd.Series = parse_numbers(amount, decimal, thousands, file_name)
+    amount: pd.Series = amount.astype(float)
     return amount
 
 
+def parse_numbers(values: pd.Series, decimal: str, thousands: str, file_name: str) -> pd.Series:
+    normalized: pd.Series = values.str.translate(str.maketrans({thousands: '', decimal: '.'}))
+    # Arrow strings convert to double[pyarrow], whose NaN is not reported by isna.
+    numbers: pd.Series = pd.to_numeric(normalized, errors='coerce').astype(float)
+
+    failed: pd.Series = numbers.isna() & values.notna()
+    if failed.any():
+        trailing_minus: pd.Series = normalized[failed].str.strip().str.endswith('-')
+        stripped: pd.Series = normalized[failed][trailing_minus].str.strip().str[:-1]
+        numbers.loc[stripped.index] = -pd.to_numeric(stripped, errors='coerce').astype(float)
+        check_for_malformed_numbers(values, numbers.isna() & values.notna(), file_name)
+    return numbers
+
+
+def check_for_malformed_numbers(values: pd.Series, malformed: pd.Series, file_name: str) -> None:
+    if malformed.any():
+        row: int = malformed.idxmax()  # type: ignore
+        log.error(f'Found {malformed.sum()} malformed amounts in {file_name}:')
+        log.error(values[malformed].to_string())
+        raise ValueError(
+            f'Malformed amount {values[row]!r} in column {values.name} of {file_name}, '
+            f'line {to_line_number(row)}'
+        )
+
+
+def to_line_number(row: int) -> int:
+    # The header is line 1, so the first data row is line 2.
+    return row + 2
+
+
 def parse_dates(df: pd.DataFrame, date_key: str, date_model: str) -> pd.Series:
     date: pd.Series = pd.to_datetime(df[date_key], format=date_model)
     return date
 
 
 def parse_text(df: pd.DataFrame, text_keys: list[str]) -> pd.Series:
-    df.fillna('-', inplace=True)
-    text: pd.Series = df.loc[:, text_keys].agg(';'.join, axis=1)
-    return text
+    texts: list[pd.Series] = [df[text_key].fillna('-') for text_key in text_keys]
+    text: pd.Series = texts[0].str.cat(texts[1:], sep=';') if len(texts) > 1 else texts[0]
+    return text.rename(None)
@@ -1,11 +1,12 @@
 from pathlib import Path
 
 import pandas as pd
+from loguru import logger as log
 from pandera.typing import DataFrame
 
-from myfinances.config_utils import RenameConfigs, to_config
+from myfinances.config_utils import RenameConfig, RenameConfigs, to_config
 from myfinances.parse_data import Transaction
-from myfinances.utils import get_rows_by_exact_string
+from myfinances.utils import recode_categories
 
 
 def rename_transactions(
@@ -15,14 +16,56 @@ def rename_transactions(
         rename_transactions_class: RenameConfigs = to_config(
             rename_transaction_config, RenameConfigs
         )
-        for transaction in rename_transactions_class.transactions:
-            rename_transaction(df, transaction.old_text, transaction.new_text)
+        rename_by_configs(df, rename_transactions_class.transactions)
     return df
 
 
-def rename_transaction(
-    df: DataFrame[Transaction], old_text: str, new_text: str
+def rename_by_configs(
+    df: DataFrame[Transaction], rename_configs: list[RenameConfig]
 ) -> DataFrame[Transaction]:
-    rows_to_rename: pd.Series = get_rows_by_exact_string(df, old_text)
-    df.loc[rows_to_rename, Transaction.Text] = new_text
+    renames, renamed_by_rule = compose_renames(rename_configs)
+    hits: list[int] = count_rename_hits(df, renamed_by_rule)
+    for rename_config, rule_hits in zip(rename_configs, hits):
+        log.debug(
+            f'Renamed {rule_hits} entries from {rename_config.old_text} to {rename_config.new_text}'
+        )
+    apply_renames(df, renames)
     return df
+
+
+def compose_renames(
+    rename_configs: list[RenameConfig],
+) -> tuple[dict[str, str], list[list[str]]]:
+    renames: dict[str, str] = {}
+    renamed_by_rule: list[list[str]] = []
+    for rename_config in rename_configs:
+        renamed: list[str] = [
+            text for text, current in renames.items() if current == rename_config.old_text
+        ]
+        if rename_config.old_text not in renames:
+            renamed.append(rename_config.old_text)
+        for text in renamed:
+            renames[text] = rename_config.new_text
+        renamed_by_rule.append(renamed)
+    return renames, renamed_by_rule
+
+
+def count_rename_hits(df: DataFrame[Transaction], renamed_by_rule: list[list[str]]) -> list[int]:
+    text_counts: pd.Series = df[Transaction.Text].value_counts()
+    return [int(text_counts.reindex(renamed, fill_value=0).sum()) for renamed in renamed_by_rule]
+
+
+def apply_renames(df: DataFrame[Transaction], renames: dict[str, str]) -> None:
+    if not renames:
+        return
+    text: pd.Series = df[Transaction.Text]
+    if isinstance(text.dtype, pd.CategoricalDtype):
+        df[Transaction.Text] = recode_categories(
+            text, map_texts(text.cat.categories.to_series(), renames)
+        )
+    else:
+        df[Transaction.Text] = map_texts(text, renames)
+
+
+def map_texts(texts: pd.Series, renames: dict[str, str]) -> pd.Series:
+    return texts.mask(texts.isin(renames.keys()), texts.map(renames))
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger as log
+from pandera.typing import DataFrame
+
+from myfinances.aho_corasick import AhoCorasick
+from myfinances.config_utils import InputConfig, LabelConfig, RenameConfigs, load_yaml, to_config
+from myfinances.drop_data import check_dropped, get_drop_rules, match_drop_rules
+from myfinances.fingerprint import count_occurrences, get_fingerprints, hash_rows, is_in_sorted
+from myfinances.label_data import (
+    LabelEngine,
+    TransactionLabeled,
+    add_empty_labels_columns,
+    check_for_unlabeled_transactions,
+    load_label_configs,
+)
+from myfinances.parse_data import Transaction, parse_file_chunks
+from myfinances.rename_transactions import rename_by_configs
+from myfinances.validation import check_types
+
+
+class StreamingLabeler:
+    def __init__(
+        self, configs_paths, first_match: bool = False, cache_dir: Path | None = None
+    ) -> None:
+        self.rename_configs: RenameConfigs = RenameConfigs(transactions=[])
+        if configs_paths.rename_transactions_config.is_file():
+            self.rename_configs = to_config(configs_paths.rename_transactions_config, RenameConfigs)
+        self.drop_transactions: dict[str, list[str]] = {}
+        if configs_paths.drop_transactions_config.is_file():
+            self.drop_transactions = load_yaml(configs_paths.drop_transactions_config)
+        self.label_configs: list[LabelConfig] = load_label_configs(configs_paths.label_configs)
+        self.label_engine: LabelEngine = LabelEngine(
+            self.label_configs,
+            first_match,
+            cache_dir,
+            label_config_files=configs_paths.label_configs,
+        )
+
+        self.seen_fingerprints: np.ndarray = np.zeros(0, dtype=np.uint64)
+        self.file_fingerprints: list[np.ndarray] = []
+        self.file_row_counts: pd.Series = pd.Series(dtype=int)
+        self.entries_dropped: dict[tuple[str, str], int] = dict.fromkeys(
+            get_drop_rules(self.drop_transactions), 0
+        )
+        self.drop_automaton: AhoCorasick = AhoCorasick(
+            [transaction for _, transaction in self.entries_dropped]
+        )
+
+    def label_chunk(self, df: DataFrame[Transaction]) -> DataFrame[TransactionLabeled]:
+        df = self.drop_seen_rows(df)
+        df[Transaction.Text] = df[Transaction.Text].astype('category')
+        rename_by_configs(df, self.rename_configs.transactions)
+        df = self.drop_by_config(df)
+        df_with_labels: DataFrame[TransactionLabeled] = add_empty_labels_columns(
+            df, self.label_configs
+        )
+        return self.label_engine.set_labels(df_with_labels)
+
+    def start_file(self) -> None:
+        self.seen_fingerprints = np.unique(
+            np.concatenate([self.seen_fingerprints, *self.file_fingerprints])
+        )
+        self.file_fingerprints = []
+        self.file_row_counts = pd.Series(dtype=int)
+
+    def drop_seen_rows(self, df: DataFrame[Transaction]) -> DataFrame[Transaction]:
+        row_hashes: np.ndarray = hash_rows(df)
+        occurrences: np.ndarray = count_occurrences(row_hashes, self.file_row_counts)
+        self.file_row_counts = self.file_row_counts.add(
+            pd.Series(row_hashes).value_counts(), fill_value=0
+        )
+        fingerprints: np.ndarray = get_fingerprints(row_hashes, occurrences)
+        self.file_fingerprints.append(fingerprints)
+        is_seen: np.ndarray = is_in_sorted(fingerprints, self.seen_fingerprints)
+        return df.loc[~is_seen]  # type: ignore
+
+    def drop_by_config(self, df: DataFrame[Transaction]) -> DataFrame[Transaction]:
+        drop_rules: list[tuple[str, str]] = list(self.entries_dropped)
+        to_drop, hits = match_drop_rules(df, drop_rules, self.drop_automaton)
+        for drop_rule, entries_dropped in zip(drop_rules, hits):
+            self.entries_dropped[drop_rule] += int(entries_dropped)
+        return df.loc[~to_drop]  # type: ignore
+
+    def check_dropped(self) -> None:
+        for (reason, transaction), entries_dropped in self.entries_dropped.items():
+            check_dropped(entries_dropped, reason, transaction)
+            log.debug(f'Dropped {entries_dropped} with reason {reason}')
+
+
+def get_labled_data_streaming(
+    configs_paths, chunksize: int, first_match: bool = False, cache_dir: Path | None = None
+) -> DataFrame[TransactionLabeled]:
+    inputs: list[InputConfig] = to_config(configs_paths.inputs_config, list[InputConfig])
+    labeler: StreamingLabeler = StreamingLabeler(configs_paths, first_match, cache_dir)
+    dfs: list[DataFrame[TransactionLabeled]] = []
+    for input_config in inputs:
+        for file in input_config.Files:
+            labeler.start_file()
+            dfs += [
+                labeler.label_chunk(df) for df in parse_file_chunks(file, input_config, chunksize)
+            ]
+    labeler.check_dropped()
+    labeler.label_engine.flush_cache()
+    return concat_labeled_chunks(dfs)
+
+
+@check_types
+def concat_labeled_chunks(
+    dfs: list[DataFrame[TransactionLabeled]],
+) -> DataFrame[TransactionLabeled]:
+    df: DataFrame[TransactionLabeled] = pd.concat(dfs)  # type: ignore
+    df[TransactionLabeled.Text] = df[TransactionLabeled.Text].astype('category')
+    df[TransactionLabeled.Account] = df[TransactionLabeled.Account].astype('category')
+    check_for_unlabeled_transactions(df)
+    return df
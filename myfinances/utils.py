@@ -1,15 +1,38 @@
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
+from myfinances.aho_corasick import AhoCorasick
 from myfinances.parse_data import Transaction
 
 
-def get_rows_by_string(df, string) -> pd.Series:
-    return df[Transaction.Text].str.contains(string, regex=False)
+def broadcast_codes(ser: pd.Series, values: np.ndarray, fill_value) -> np.ndarray:
+    # Missing values have code -1 and pick the appended fill value.
+    return np.append(values, fill_value)[ser.cat.codes.to_numpy()]
 
 
-def get_rows_by_exact_string(df, string) -> pd.Series:
-    return df[Transaction.Text].str.fullmatch(string)
+def encode_text(df) -> tuple[np.ndarray, pd.Index]:
+    text: pd.Series = df[Transaction.Text]
+    if isinstance(text.dtype, pd.CategoricalDtype):
+        return text.cat.codes.to_numpy(), text.cat.categories
+    codes, texts = pd.factorize(text)
+    return codes, pd.Index(texts)
+
+
+def get_first_matches(df, automaton: AhoCorasick) -> np.ndarray:
+    codes, texts = encode_text(df)
+    first_matches: list[int] = [
+        min(automaton.find_all(text), default=-1) if isinstance(text, str) else -1 for text in texts
+    ]
+    return np.array(first_matches + [-1], dtype=int)[codes]
+
+
+def recode_categories(ser: pd.Series, new_categories: pd.Series) -> pd.Series:
+    codes, uniques = pd.factorize(new_categories, sort=True)
+    categorical: pd.Categorical = pd.Categorical.from_codes(
+        broadcast_codes(ser, codes, -1), categories=uniques
+    )
+    return pd.Series(categorical, index=ser.index, name=ser.name)
 
 
 def get_previous_day(date: pd.Timestamp) -> pd.Timestamp:
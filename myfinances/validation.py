@@ -0,0 +1,70 @@
+import functools
+import inspect
+import os
+import time
+from enum import Enum
+from typing import Callable, get_args, get_origin, get_type_hints
+
+import pandas as pd
+from loguru import logger as log
+from pandera.typing import DataFrame
+
+VALIDATION_ENV: str = 'MYFINANCES_VALIDATION'
+DEFAULT_SAMPLE_SIZE: int = 1000
+
+
+class ValidationLevel(str, Enum):
+    FULL = 'full'
+    SAMPLE = 'sample'
+    OFF = 'off'
+
+
+_validation_level: ValidationLevel | None = None
+_sample_size: int = DEFAULT_SAMPLE_SIZE
+
+
+def set_validation_level(
+    level: ValidationLevel | str, sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> None:
+    global _validation_level, _sample_size
+    _validation_level = ValidationLevel(level)
+    _sample_size = sample_size
+
+
+def get_validation_level() -> ValidationLevel:
+    if _validation_level is not None:
+        return _validation_level
+    return ValidationLevel(os.environ.get(VALIDATION_ENV, ValidationLevel.FULL.value))
+
+
+def check_types(func: Callable) -> Callable:
+    signature: inspect.Signature = inspect.signature(func)
+    type_hints: dict = get_type_hints(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments: dict = signature.bind(*args, **kwargs).arguments
+        for name, value in arguments.items():
+            validate(value, type_hints.get(name), f'{func.__name__}({name})')
+        result = func(*args, **kwargs)
+        return validate(result, type_hints.get('return'), f'{func.__name__} return value')
+
+    return wrapper
+
+
+def validate(value, type_hint, checkpoint: str):
+    if get_origin(type_hint) is not DataFrame or not isinstance(value, pd.DataFrame):
+        return value
+    level: ValidationLevel = get_validation_level()
+    if level == ValidationLevel.OFF:
+        return value
+
+    (model,) = get_args(type_hint)
+    start: float = time.perf_counter()
+    if level == ValidationLevel.SAMPLE and value.shape[0] > _sample_size:
+        model.validate(value, sample=_sample_size, random_state=0)
+    else:
+        value = model.validate(value)
+    duration: float = time.perf_counter() - start
+    log.info(f'Validated {checkpoint} ({level.value}) in {duration * 1000:.1f} ms')
+    return value
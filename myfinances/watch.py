@@ -0,0 +1,125 @@
+import time
+from pathlib import Path
+
+import pandas as pd
+import yaml
+from loguru import logger as log
+from pandera.typing import DataFrame
+
+from myfinances.config_utils import Configs, LabelConfig, to_config
+from myfinances.drop_data import drop_data
+from myfinances.label_data import (
+    LabelEngine,
+    TransactionLabeled,
+    add_empty_labels_columns,
+    check_for_unlabeled_transactions,
+    load_label_configs,
+)
+from myfinances.parse_data import Transaction, load_data
+from myfinances.rename_transactions import rename_transactions
+
+POLL_INTERVAL: float = 0.5
+CONFIG_ERRORS: tuple = (KeyError, ValueError, OSError, yaml.YAMLError)
+
+
+class LabelWatcher:
+    def __init__(
+        self,
+        config_file: Path,
+        n_workers: int = 1,
+        cache_dir: Path | None = None,
+        first_match: bool = False,
+    ) -> None:
+        self.config_file: Path = config_file
+        self.n_workers: int = n_workers
+        self.cache_dir: Path | None = cache_dir
+        self.first_match: bool = first_match
+
+        self.configs_paths: Configs = to_config(config_file, Configs)
+        self.data_mtimes: dict[Path, int] = {}
+        self.label_mtimes: dict[Path, int] = {}
+        self.df: DataFrame[Transaction] | None = None
+        self.df_labeled: DataFrame[TransactionLabeled] | None = None
+        self.rule_table: pd.DataFrame | None = None
+
+    def run(self) -> None:
+        log.info(f'Watching {self.config_file} and its label configurations')
+        try:
+            while True:
+                self.poll()
+                time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            log.info('Stopped watching')
+
+    def poll(self) -> None:
+        try:
+            self.configs_paths = to_config(self.config_file, Configs)
+            data_mtimes: dict[Path, int] = get_mtimes(self.get_data_files())
+            label_mtimes: dict[Path, int] = get_mtimes(self.configs_paths.label_configs)
+        except CONFIG_ERRORS as e:
+            log.error(f'Invalid configuration, waiting for the next change: {e!r}')
+            return
+        data_changed: bool = data_mtimes != self.data_mtimes
+        if not data_changed and label_mtimes == self.label_mtimes:
+            return
+        self.data_mtimes, self.label_mtimes = data_mtimes, label_mtimes
+        if data_changed:
+            self.load()
+        if self.df is not None:
+            self.label()
+
+    def get_data_files(self) -> list[Path]:
+        return [
+            self.config_file,
+            self.configs_paths.inputs_config,
+            self.configs_paths.rename_transactions_config,
+            self.configs_paths.drop_transactions_config,
+        ]
+
+    def load(self) -> None:
+        self.df, self.df_labeled, self.rule_table = None, None, None
+        try:
+            transactions_all: DataFrame[Transaction] = load_data(
+                self.configs_paths.inputs_config, self.n_workers, self.cache_dir
+            )
+            transactions_renamed: DataFrame[Transaction] = rename_transactions(
+                transactions_all, self.configs_paths.rename_transactions_config
+            )
+            self.df = drop_data(transactions_renamed, self.configs_paths.drop_transactions_config)
+        except CONFIG_ERRORS as e:
+            log.error(f'Loading failed, waiting for the next change: {e!r}')
+
+    def label(self) -> None:
+        start: float = time.perf_counter()
+        try:
+            label_configs: list[LabelConfig] = load_label_configs(self.configs_paths.label_configs)
+            engine: LabelEngine = LabelEngine(
+                label_configs,
+                self.first_match,
+                self.cache_dir,
+                label_config_files=self.configs_paths.label_configs,
+            )
+            if self.df_labeled is None or self.rule_table is None:
+                df: DataFrame[TransactionLabeled] = add_empty_labels_columns(
+                    self.df,  # type: ignore
+                    label_configs,
+                )
+                engine.set_labels(df)
+            else:
+                df: DataFrame[TransactionLabeled] = self.df_labeled.copy()  # type: ignore
+                engine.relabel(df, self.rule_table)
+        except CONFIG_ERRORS as e:
+            log.error(f'Labeling failed, waiting for the next change: {e!r}')
+            return
+        engine.flush_cache()
+        self.df_labeled, self.rule_table = df, engine.get_rule_table()
+        log.info(f'Labeled transactions in {(time.perf_counter() - start) * 1000:.1f} ms')
+        try:
+            check_for_unlabeled_transactions(df)
+        except KeyError:
+            return
+        log.info('All transactions are labeled')
+
+
+def get_mtimes(files: list[Path]) -> dict[Path, int]:
+    return {file: file.stat().st_mtime_ns for file in files if file.is_file()}
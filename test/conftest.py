@@ -0,0 +1,8 @@
+import pytest
+
+from myfinances.validation import ValidationLevel, set_validation_level
+
+
+@pytest.fixture(autouse=True, scope='session')
+def full_validation():
+    set_validation_level(ValidationLevel.FULL)
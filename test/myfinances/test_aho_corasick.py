@@ -0,0 +1,31 @@
+import pytest
+
+import myfinances.aho_corasick as ac
+from myfinances.aho_corasick import AhoCorasick
+
+
+@pytest.mark.parametrize(
+    'text, matches_expected',
+    [
+        ('ushers', {1, 2, 3, 4}),
+        ('his', {0, 4}),
+        ('xyz', {4}),
+        ('', {4}),
+    ],
+)
+def test_find_all(text, matches_expected) -> None:
+    automaton: AhoCorasick = AhoCorasick(['his', 'he', 'she', 'hers', ''])
+    assert automaton.find_all(text) == matches_expected
+
+
+def test_find_all_duplicated_patterns() -> None:
+    automaton: AhoCorasick = AhoCorasick(['ab', 'b', 'ab'])
+    assert automaton.find_all('cab') == {0, 1, 2}
+
+
+def test_match_texts_parallel() -> None:
+    texts: list[str] = ['ushers', 'his', 'ä€', '']
+    pattern_sets: list[list[str]] = [['his', 'he'], ['€', ''], []]
+    matches: list[list[list[int]]] = ac.match_texts_parallel(texts, pattern_sets, 2)
+    assert matches == [ac.match_texts(texts, patterns) for patterns in pattern_sets]
+    assert matches[1] == [[1], [1], [0, 1], [1]]
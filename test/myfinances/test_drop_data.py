@@ -16,24 +16,13 @@ def df_before() -> DataFrame[Transaction]:
     return df_before
 
 
-@pytest.fixture
-def ser_bool() -> pd.Series:
-    ser_bool: pd.Series = pd.Series([False, False, True, False, True])
-    return ser_bool
-
-
-def mock_get_rows_by_string(*args, **kwargs) -> pd.Series:
-    ser_bool: pd.Series = pd.Series([False, False, True, False, True])
-    return ser_bool
-
-
 def mock_load_yaml(*args, **kwargs) -> dict:
     config: dict = {'reason_1': ['3', '2'], 'reason_2': ['-1']}
     return config
 
 
 def test_drop_data_no_config(df_before) -> None:
-    df_expected: pd.DataFrame = df_before.iloc[:-1, :]
+    df_expected: pd.DataFrame = df_before.copy()
     df: DataFrame[Transaction] = dt.drop_data(df_before, Path())
     pd.testing.assert_frame_equal(df, df_expected)
 
@@ -45,20 +34,20 @@ def test_drop_data(df_before, monkeypatch) -> None:
     pd.testing.assert_frame_equal(df, df_expected)
 
 
-def test_drop_transaction_by_key_and_reason(df_before, monkeypatch, ser_bool) -> None:
-    monkeypatch.setattr(dt, 'get_rows_by_string', mock_get_rows_by_string)
-    df_expected: pd.DataFrame = df_before.iloc[ser_bool[~ser_bool].index.values, :]  # type:ignore
-    df: DataFrame[Transaction] = dt.drop_transaction_by_key_and_reason(df_before, '', '')
-    pd.testing.assert_frame_equal(df, df_expected)
+def test_check_dropped() -> None:
+    with pytest.raises(KeyError):
+        dt.check_dropped(0, '', '')
+    dt.check_dropped(1, '', '')
 
 
-def test_drop_by_bool(df_before, ser_bool) -> None:
-    df_expected: pd.DataFrame = df_before.iloc[ser_bool[~ser_bool].index.values, :]  # type:ignore
-    df: DataFrame[Transaction] = dt.drop_by_bool(df_before, ser_bool, '', '')
-    pd.testing.assert_frame_equal(df, df_expected)
+def test_match_drop_rules(df_before) -> None:
+    drop_rules: list[tuple[str, str]] = [('reason_1', '1'), ('reason_1', '-'), ('reason_2', '2')]
+    to_drop, hits = dt.match_drop_rules(df_before, drop_rules)
+    assert to_drop.tolist() == [True, True, True, False, True]
+    assert hits.tolist() == [2, 0, 2]
 
 
-def test_check_dropped() -> None:
+def test_drop_data_rule_without_exclusive_hits(df_before, monkeypatch) -> None:
+    monkeypatch.setattr(dt, 'load_yaml', lambda *args, **kwargs: {'reason_1': ['1', '-1']})
     with pytest.raises(KeyError):
-        dt.check_dropped(0, '', '')
-    dt.check_dropped(1, '', '')
+        dt.drop_data(df_before, Path(__file__))
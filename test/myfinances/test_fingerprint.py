@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import myfinances.fingerprint as fp
+from myfinances.parse_data import Transaction
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    df: pd.DataFrame = pd.DataFrame(
+        {
+            Transaction.Date: [pd.Timestamp(year=2024, month=1, day=1)] * 3,
+            Transaction.Text: ['a', 'b', 'a'],
+            Transaction.Amount: [1.0, 1.0, 1.0],
+            Transaction.Account: ['Test'] * 3,
+        }
+    )
+    return df
+
+
+def test_add_fingerprints_keeps_repeated_rows_distinct(df) -> None:
+    df_fingerprints: pd.DataFrame = fp.add_fingerprints(df)
+    assert df_fingerprints[fp.ROW_HASH].iloc[0] == df_fingerprints[fp.ROW_HASH].iloc[2]
+    assert df_fingerprints[fp.FINGERPRINT].is_unique
+
+
+def test_add_fingerprints_appended(df) -> None:
+    df_known: pd.DataFrame = fp.add_fingerprints(df.iloc[:2])
+    df_appended: pd.DataFrame = fp.add_fingerprints(df.iloc[2:], df_known)
+    pd.testing.assert_frame_equal(pd.concat([df_known, df_appended]), fp.add_fingerprints(df))
+
+
+def test_pop_fingerprints(df) -> None:
+    df_fingerprints: pd.DataFrame = fp.add_fingerprints(df)
+    fingerprints: np.ndarray = fp.pop_fingerprints(df_fingerprints)
+    pd.testing.assert_frame_equal(df_fingerprints, df)
+    np.testing.assert_array_equal(fingerprints, fp.pop_fingerprints(df))
+
+
+def test_find_overlapping_rows(df) -> None:
+    fingerprints: list[np.ndarray] = [
+        fp.pop_fingerprints(df.iloc[:2]),
+        fp.pop_fingerprints(df),
+    ]
+    assert fp.find_overlapping_rows(fingerprints).tolist() == [
+        False,
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_is_in_sorted() -> None:
+    sorted_values: np.ndarray = np.array([2, 5, 9], dtype=np.uint64)
+    values: np.ndarray = np.array([1, 2, 6, 9, 10], dtype=np.uint64)
+    assert fp.is_in_sorted(values, sorted_values).tolist() == [False, True, False, True, False]
+    assert not fp.is_in_sorted(values, np.zeros(0, dtype=np.uint64)).any()
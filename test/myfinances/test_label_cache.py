@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandera.typing import DataFrame
+
+import myfinances.label_data as ld
+from myfinances.config_utils import LabelConfig
+from myfinances.label_cache import LABEL_CACHE_DIR, LabelCache, label_cache_key
+from myfinances.label_data import TransactionLabeled
+
+
+@pytest.fixture
+def df() -> DataFrame[TransactionLabeled]:
+    size: int = 4
+    df: DataFrame[TransactionLabeled] = pd.DataFrame(
+        {
+            TransactionLabeled.Date: pd.date_range(start='2024-01-01', periods=size),
+            TransactionLabeled.Text: pd.Categorical(['ab', 'b', 'c', 'ab']),
+            TransactionLabeled.Amount: [1.0, -2.0, 3.0, -4.0],
+            TransactionLabeled.Account: pd.Categorical(['account'] * size),
+        }
+    )  # type: ignore
+    return ld.add_empty_labels_columns(df)
+
+
+@pytest.fixture
+def label_configs() -> list[LabelConfig]:
+    return [
+        LabelConfig(label='food', sublabels={'apple': ['a'], 'cherry': ['c']}),
+        LabelConfig(label='income', sublabels={'bonus': ['b']}, is_income=True),
+    ]
+
+
+def test_label_engine_cached(df, label_configs, tmp_path) -> None:
+    df_expected: DataFrame[TransactionLabeled] = ld.LabelEngine(
+        label_configs, first_match=True
+    ).set_labels(df.copy())
+    for _ in range(2):
+        engine: ld.LabelEngine = ld.LabelEngine(label_configs, True, tmp_path)
+        pd.testing.assert_frame_equal(engine.set_labels(df.copy()), df_expected)
+        engine.flush_cache()
+    assert 'automaton' not in engine.__dict__
+
+
+def test_label_engine_cached_conflicts(df, label_configs, tmp_path) -> None:
+    ld.set_labels_by_config(df.copy(), label_configs, True, tmp_path)
+    with pytest.raises(KeyError):
+        ld.LabelEngine(label_configs, cache_dir=tmp_path).set_labels(df)
+
+
+def test_label_cache_invalidated_per_config(df, label_configs, tmp_path) -> None:
+    ld.set_labels_by_config(df.copy(), label_configs, first_match=True, cache_dir=tmp_path)
+    label_configs[1].sublabels['bonus'].append('ab')
+    cache: LabelCache = LabelCache(tmp_path, label_configs, ['food', 'income'])
+    assert cache.matches[0] == {'ab': [0], 'b': [], 'c': [1]}
+    assert cache.matches[1] == {}
+    assert cache.get_missing_texts(pd.Index(['ab', 'b'])) == ['ab', 'b']
+    assert sorted(path.stem for path in (tmp_path / LABEL_CACHE_DIR).glob('*.parquet')) == [
+        label_cache_key('food', label_configs[0])
+    ]
+
+
+def test_label_cache_shared(df, label_configs, tmp_path) -> None:
+    other_configs: list[LabelConfig] = [
+        LabelConfig(label='food', sublabels={'apple': ['ab'], 'cherry': ['c']}),
+        LabelConfig(label='income', sublabels={'bonus': ['b']}, is_income=True),
+    ]
+    files: list[Path] = [tmp_path / 'food.yaml', tmp_path / 'income.yaml']
+    other_files: list[Path] = [tmp_path / 'other' / 'food.yaml', tmp_path / 'other' / 'income.yaml']
+    (tmp_path / 'other').mkdir()
+    for file in files + other_files:
+        file.touch()
+    for configs, config_files in [(label_configs, files), (other_configs, other_files)]:
+        engine: ld.LabelEngine = ld.LabelEngine(
+            configs, True, tmp_path, label_config_files=config_files
+        )
+        engine.set_labels(df.copy())
+        engine.flush_cache()
+    sources: list[str] = [str(file.resolve()) for file in files]
+    assert (
+        LabelCache(tmp_path, label_configs, sources).get_missing_texts(pd.Index(['ab', 'b'])) == []
+    )
+    assert len(list((tmp_path / LABEL_CACHE_DIR).glob('*.parquet'))) == 4
+
+    other_files[0].unlink()
+    LabelCache(tmp_path, label_configs, sources)
+    assert len(list((tmp_path / LABEL_CACHE_DIR).glob('*.parquet'))) == 3
+
+
+def test_label_cache_flushed_once(df, label_configs, tmp_path, monkeypatch) -> None:
+    stored: list[str] = []
+    store = LabelCache.store
+    monkeypatch.setattr(
+        LabelCache,
+        'store',
+        lambda self, key, matches: stored.append(key) or store(self, key, matches),
+    )
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs, True, tmp_path)
+    for rows in [slice(0, 2), slice(2, 4)]:
+        engine.set_labels(df.iloc[rows].copy())
+    assert stored == []
+    engine.flush_cache()
+    assert stored == engine.label_cache.keys  # type: ignore
+    engine.flush_cache()
+    assert stored == engine.label_cache.keys  # type: ignore
+
+
+def test_label_cache_prunes_unused_texts(df, label_configs, tmp_path) -> None:
+    ld.set_labels_by_config(df.copy(), label_configs, True, tmp_path)
+    df_fewer: DataFrame[TransactionLabeled] = df.iloc[1:3].copy()  # type: ignore
+    df_fewer[TransactionLabeled.Text] = df_fewer[
+        TransactionLabeled.Text
+    ].cat.remove_unused_categories()
+    ld.set_labels_by_config(df_fewer, label_configs, True, tmp_path)
+    cache: LabelCache = LabelCache(tmp_path, label_configs, ['food', 'income'])
+    assert cache.matches == [{'b': [], 'c': [1]}, {'b': [0], 'c': []}]
+
+
+def test_label_cache_relabel_keeps_texts(df, label_configs, tmp_path) -> None:
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs, True, tmp_path)
+    df_labeled: DataFrame[TransactionLabeled] = engine.set_labels(df.copy())
+    engine.flush_cache()
+    label_configs[1].sublabels['bonus'] = ['x']
+    engine_changed: ld.LabelEngine = ld.LabelEngine(label_configs, True, tmp_path)
+    engine_changed.relabel(df_labeled, engine.get_rule_table())
+    engine_changed.flush_cache()
+    cache: LabelCache = LabelCache(tmp_path, label_configs, ['food', 'income'])
+    assert cache.matches == [{'ab': [0], 'b': [], 'c': [1]}, {'b': []}]
@@ -1,16 +1,31 @@
+from pathlib import Path
+
 import pandas as pd
 import pytest
 from pandera.typing import DataFrame
 
 import myfinances.label_data as ld
+from myfinances.config_utils import LabelConfig
 from myfinances.label_data import TransactionLabeled
 from myfinances.parse_data import Transaction
 
 
 @pytest.fixture
 def df() -> DataFrame[TransactionLabeled]:
-    df: DataFrame[TransactionLabeled] = TransactionLabeled.example(size=4)  # type: ignore
-    return df
+    size: int = 4
+    df: DataFrame[TransactionLabeled] = pd.DataFrame(
+        {
+            TransactionLabeled.Date: pd.date_range(start='2024-01-01', periods=size),
+            TransactionLabeled.Text: pd.Categorical(['a', 'b', 'c', 'd']),
+            TransactionLabeled.Amount: [1.0, -2.0, 3.0, -4.0],
+            TransactionLabeled.Account: pd.Categorical(['account'] * size),
+            TransactionLabeled.Label: pd.Categorical(['label'] * size),
+            TransactionLabeled.Sublabel: pd.Categorical(['sublabel'] * size),
+            TransactionLabeled.IsIncome: [False] * size,
+            TransactionLabeled.RuleId: [0] * size,
+        }
+    )  # type: ignore
+    return TransactionLabeled.validate(df)  # type: ignore
 
 
 @pytest.fixture
@@ -18,38 +33,30 @@ def df_no_labels(df: DataFrame[TransactionLabeled]) -> DataFrame[TransactionLabe
     df_no_labels: DataFrame[TransactionLabeled] = df.copy()
     df_no_labels.loc[:, TransactionLabeled.Label] = None
     df_no_labels.loc[:, TransactionLabeled.Sublabel] = None
+    df_no_labels.loc[:, TransactionLabeled.RuleId] = -1
     return df_no_labels
 
 
-@pytest.fixture
-def rows_to_label(df: DataFrame[TransactionLabeled]) -> pd.Series:
-    ser: pd.Series = pd.Series([True] + [False] * (df.shape[0] - 2) + [True])
-    return ser
-
-
 def test_add_empty_labels_columns() -> None:
-    df_no_labels: DataFrame[Transaction] = Transaction.example(size=0)  # type:ignore
+    df_no_labels: DataFrame[Transaction] = Transaction.empty()  # type:ignore
     df: DataFrame[TransactionLabeled] = ld.add_empty_labels_columns(df_no_labels)
-    assert all(df.columns == TransactionLabeled.example(size=0).columns)  # type:ignore
+    assert all(df.columns == TransactionLabeled.empty().columns)  # type:ignore
 
 
-def test_set_label(df_no_labels: DataFrame[TransactionLabeled], rows_to_label: pd.Series) -> None:
-    label: str = 'test_label'
-    sublabel: str = 'test_sublabel'
-    is_income: bool = True
-    ld.set_label(df_no_labels, rows_to_label, label, sublabel, is_income)
-    pd.testing.assert_frame_equal(
-        df_no_labels.loc[~rows_to_label, :], df_no_labels.loc[~rows_to_label, :]
+def test_add_empty_labels_columns_categories() -> None:
+    label_config: LabelConfig = LabelConfig(label='food', sublabels={'coffee': [], 'tea': []})
+    df: DataFrame[TransactionLabeled] = ld.add_empty_labels_columns(
+        Transaction.empty(),  # type:ignore
+        [label_config],
     )
-    assert all(df_no_labels.loc[rows_to_label, TransactionLabeled.Label] == label)
-    assert all(df_no_labels.loc[rows_to_label, TransactionLabeled.Sublabel] == sublabel)
-    assert all(df_no_labels.loc[rows_to_label, TransactionLabeled.IsIncome] == is_income)
+    assert df[TransactionLabeled.Label].cat.categories.to_list() == ['food']
+    assert df[TransactionLabeled.Sublabel].cat.categories.to_list() == ['coffee', 'tea']
 
 
 def test_check_for_duplicated_labels(df_no_labels: DataFrame[TransactionLabeled]) -> None:
     ser: pd.Series = pd.Series([True] * df_no_labels.shape[0])
     df_with_labels: DataFrame[TransactionLabeled] = df_no_labels.copy()
-    df_with_labels.loc[0, TransactionLabeled.Label] = 'label already specified'
+    df_with_labels.loc[0, TransactionLabeled.Label] = 'label'
     with pytest.raises(KeyError):
         ld.check_for_duplicated_labels(df_with_labels, ser, '', '')
 
@@ -73,3 +80,181 @@ def test_check_sublabel_for_whitespace() -> None:
     with pytest.raises(KeyError) as error:
         ld.check_sublabel_for_whitespace(bad_label)
     assert bad_label in str(error.value)
+
+
+def get_rows_by_string(df: DataFrame[TransactionLabeled], string: str) -> pd.Series:
+    text: pd.Series = df[TransactionLabeled.Text].astype(object)
+    return text.str.contains(string, regex=False).fillna(False).astype(bool)
+
+
+def set_labels_sequentially(
+    df: DataFrame[TransactionLabeled], label_configs: list[LabelConfig]
+) -> None:
+    rule_id: int = 0
+    for label_config in label_configs:
+        for sublabel, identifiers in label_config.sublabels.items():
+            ld.check_sublabel_for_whitespace(sublabel)
+            for identifier in identifiers:
+                rows_to_label: pd.Series = get_rows_by_string(df, identifier)
+                ld.check_for_duplicated_labels(df, rows_to_label, label_config.label, sublabel)
+                ld.add_missing_category(df, TransactionLabeled.Label, label_config.label)
+                ld.add_missing_category(df, TransactionLabeled.Sublabel, sublabel)
+                df.loc[rows_to_label, TransactionLabeled.Label] = label_config.label
+                df.loc[rows_to_label, TransactionLabeled.Sublabel] = sublabel
+                df.loc[rows_to_label, TransactionLabeled.IsIncome] = label_config.is_income
+                df.loc[rows_to_label, TransactionLabeled.RuleId] = rule_id
+                rule_id += 1
+
+
+@pytest.mark.parametrize(
+    'sublabels',
+    [
+        {'first': ['a', 'c'], 'second': ['d']},
+        {'first': ['a'], 'second': ['']},
+        {'first': ['a', 'b'], 'second': ['b']},
+        {'first': ['a'], 'bad sublabel': [], 'second': ['a']},
+        {'first': ['a', 'b'], 'second': ['c', 'a']},
+        {'first': ['a'], 'bad sublabel': ['b']},
+    ],
+)
+def test_label_engine_matches_sequential_labeling(df_no_labels, sublabels) -> None:
+    label_configs: list[LabelConfig] = [
+        LabelConfig(label='label', sublabels=sublabels),
+        LabelConfig(label='income', sublabels={'third': ['b']}, is_income=True),
+    ]
+    df_expected: DataFrame[TransactionLabeled] = df_no_labels.copy()
+    try:
+        set_labels_sequentially(df_expected, label_configs)
+    except KeyError as e:
+        with pytest.raises(KeyError) as error:
+            ld.LabelEngine(label_configs).set_labels(df_no_labels)
+        assert str(error.value) == str(e)
+    else:
+        ld.LabelEngine(label_configs).set_labels(df_no_labels)
+    pd.testing.assert_frame_equal(df_no_labels, df_expected)
+
+
+def test_label_engine_prelabeled_rows(df) -> None:
+    label_configs: list[LabelConfig] = [LabelConfig(label='label', sublabels={'other': ['c']})]
+    with pytest.raises(KeyError):
+        ld.LabelEngine(label_configs).set_labels(df)
+
+
+def test_find_conflicts(df_no_labels) -> None:
+    label_configs: list[LabelConfig] = [
+        LabelConfig(label='label', sublabels={'first': ['a', 'b'], 'second': ['', 'c']}),
+    ]
+    conflicts: pd.DataFrame = ld.LabelEngine(label_configs).find_conflicts(df_no_labels)
+    assert conflicts.columns.to_list() == ld.CONFLICT_COLUMNS
+    assert conflicts.values.tolist() == [
+        ['label/first', 'a', 'label/second', '', 1],
+        ['label/first', 'b', 'label/second', '', 1],
+        ['label/second', '', 'label/second', 'c', 1],
+    ]
+
+
+def test_find_conflicts_none(df_no_labels) -> None:
+    label_configs: list[LabelConfig] = [LabelConfig(label='label', sublabels={'first': ['a']})]
+    assert ld.LabelEngine(label_configs).find_conflicts(df_no_labels).empty
+
+
+def test_label_engine_first_match(df_no_labels) -> None:
+    label_configs: list[LabelConfig] = [
+        LabelConfig(label='label', sublabels={'first': ['a', 'b'], 'second': ['c', 'a']}),
+        LabelConfig(label='income', sublabels={'third': ['']}, is_income=True),
+    ]
+    df_no_labels.loc[3, TransactionLabeled.Label] = 'label'
+    ld.LabelEngine(label_configs, first_match=True).set_labels(df_no_labels)
+    assert df_no_labels[TransactionLabeled.Sublabel].to_list()[:3] == ['first', 'first', 'second']
+    assert pd.isna(df_no_labels.loc[3, TransactionLabeled.Sublabel])
+    assert df_no_labels[TransactionLabeled.IsIncome].to_list() == [False] * 4
+
+
+@pytest.mark.parametrize('first_match', [False, True])
+def test_label_engine_parallel(df_no_labels, first_match) -> None:
+    label_configs: list[LabelConfig] = [
+        LabelConfig(label='label', sublabels={'first': ['a'], 'second': ['c', 'x']}),
+        LabelConfig(label='income', sublabels={'third': ['b', 'd']}, is_income=True),
+    ]
+    df_expected: DataFrame[TransactionLabeled] = df_no_labels.copy()
+    ld.LabelEngine(label_configs, first_match).set_labels(df_expected)
+    ld.LabelEngine(label_configs, first_match, n_workers=2).set_labels(df_no_labels)
+    pd.testing.assert_frame_equal(df_no_labels, df_expected)
+
+
+@pytest.fixture
+def label_configs() -> list[LabelConfig]:
+    return [
+        LabelConfig(label='label', sublabels={'first': ['a', 'b'], 'second': ['c']}),
+        LabelConfig(label='income', sublabels={'third': ['d']}, is_income=True),
+    ]
+
+
+def test_rule_table_and_explain_label(df_no_labels, label_configs) -> None:
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs)
+    engine.set_labels(df_no_labels)
+    assert df_no_labels[TransactionLabeled.RuleId].to_list() == [0, 1, 2, 3]
+
+    rule_table: pd.DataFrame = engine.get_rule_table([Path('label.yaml'), Path('income.yaml')])
+    assert rule_table['File'].to_list() == ['label.yaml'] * 3 + ['income.yaml']
+    explanation: pd.Series = ld.explain_label(df_no_labels, rule_table, 2)
+    assert explanation.to_list() == ['label.yaml', 'label', 'second', 'c', False]
+
+    df_no_labels.loc[1, TransactionLabeled.RuleId] = -1
+    with pytest.raises(KeyError):
+        ld.explain_label(df_no_labels, rule_table, 1)
+
+
+def test_relabel(df_no_labels, label_configs) -> None:
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs)
+    df_relabeled: DataFrame[TransactionLabeled] = engine.set_labels(df_no_labels.copy())
+    label_configs[0].sublabels['first'] = ['a']
+    label_configs[0].sublabels['fourth'] = ['b']
+    engine_changed: ld.LabelEngine = ld.LabelEngine(label_configs)
+    engine_changed.relabel(df_relabeled, engine.get_rule_table())
+
+    df_expected: DataFrame[TransactionLabeled] = engine_changed.set_labels(df_no_labels)
+    pd.testing.assert_frame_equal(df_relabeled, df_expected, check_categorical=False)
+    assert df_relabeled[TransactionLabeled.RuleId].to_list() == [0, 2, 1, 3]
+
+
+def test_relabel_matches_stale_texts(df_no_labels, label_configs, monkeypatch) -> None:
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs)
+    df_relabeled: DataFrame[TransactionLabeled] = engine.set_labels(df_no_labels.copy())
+    label_configs[0].sublabels['second'] = ['c', 'x']
+    label_configs[1].sublabels['third'] = ['e']
+    engine_changed: ld.LabelEngine = ld.LabelEngine(label_configs)
+    matched: list[str] = []
+    match = engine_changed.match
+    monkeypatch.setattr(
+        engine_changed, 'match', lambda texts: matched.extend(texts) or match(texts)
+    )
+    engine_changed.relabel(df_relabeled, engine.get_rule_table())
+    assert matched == ['d']
+    assert df_relabeled[TransactionLabeled.Label].isna().to_list() == [False] * 3 + [True]
+
+
+def test_relabel_new_identifier_overlaps_label(df_no_labels, label_configs) -> None:
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs)
+    df_relabeled: DataFrame[TransactionLabeled] = engine.set_labels(df_no_labels.copy())
+    label_configs[1].sublabels['third'] = ['d', 'c']
+    with pytest.raises(KeyError):
+        ld.LabelEngine(label_configs).set_labels(df_no_labels.copy())
+    with pytest.raises(KeyError):
+        ld.LabelEngine(label_configs).relabel(df_relabeled, engine.get_rule_table())
+
+
+@pytest.mark.parametrize('reorder', [False, True])
+def test_relabel_first_match(df_no_labels, label_configs, reorder) -> None:
+    label_configs[1].sublabels['third'] = ['d', 'a']
+    engine: ld.LabelEngine = ld.LabelEngine(label_configs, first_match=True)
+    df_relabeled: DataFrame[TransactionLabeled] = engine.set_labels(df_no_labels.copy())
+    if reorder:
+        label_configs.reverse()
+    else:
+        label_configs[0].sublabels = {'zeroth': ['c'], **label_configs[0].sublabels}
+    engine_changed: ld.LabelEngine = ld.LabelEngine(label_configs, first_match=True)
+    engine_changed.relabel(df_relabeled, engine.get_rule_table())
+
+    df_expected: DataFrame[TransactionLabeled] = engine_changed.set_labels(df_no_labels)
+    pd.testing.assert_frame_equal(df_relabeled, df_expected, check_categorical=False)
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pandas as pd
 import pytest
 from pandera.typing import DataFrame
@@ -91,3 +93,89 @@ def test_get_monthly_expenses(monthly_costs, month_split_day) -> None:
     assert monthly_expenses['Amount'].to_list() == [-30, 0, 0]
     for _, row in monthly_expenses.iterrows():
         row['Date'].day == month_split_day  # pyright: ignore
+
+
+def test_get_monthly_expenses_month_without_transactions_at_start(df_test) -> None:
+    df: DataFrame[TransactionLabeled] = df_test.loc[
+        (df_test[TransactionLabeled.Date] < '2024-02-27')
+        | (df_test[TransactionLabeled.Date] > '2024-02-29')
+    ]  # type: ignore
+    monthly_expenses: pd.DataFrame = MonthlyCosts(df, 27).get_monthly_transactions()
+    assert monthly_expenses['Date'].to_list() == [
+        pd.Timestamp(year=2024, month=1, day=27),
+        pd.Timestamp(year=2024, month=2, day=27),
+        pd.Timestamp(year=2024, month=3, day=27),
+    ]
+
+
+def test_get_transactions_unsorted_dates(df_test, month_split_day) -> None:
+    df_expected: DataFrame[TransactionLabeled] = MonthlyCosts(
+        df_test, month_split_day
+    ).get_transactions()
+    df_shuffled: DataFrame[TransactionLabeled] = df_test.sample(frac=1, random_state=0)  # type: ignore
+    monthly_costs: MonthlyCosts = MonthlyCosts(df_shuffled, month_split_day)
+    pd.testing.assert_frame_equal(monthly_costs.get_transactions(), df_expected)
+
+
+def test_add_costs_by_config(df_test, month_split_day, tmp_path) -> None:
+    add_config: Path = tmp_path / 'add_transactions.yaml'
+    add_config.write_text('saving:\n  Label: future\n  Sublabel: saving\n  Amount: -5.0\n')
+    df_test.loc[df_test.index[::2], TransactionLabeled.Sublabel] = 'dropped'
+    monthly_costs: MonthlyCosts = MonthlyCosts(df_test, month_split_day)
+    monthly_costs.drop_costs('test_label', 'dropped')
+    monthly_costs.add_costs_by_config(add_config)
+    df: DataFrame[TransactionLabeled] = monthly_costs.get_transactions()
+    assert (df[TransactionLabeled.Sublabel] != 'dropped').all()
+    assert df[TransactionLabeled.Sublabel].value_counts()['saving'] == 3
+    assert df[TransactionLabeled.Date].is_monotonic_increasing
+
+
+def test_memoize(monthly_costs) -> None:
+    monthly_costs.get_averaged_expenses_by_label()
+    hits, misses, _ = monthly_costs.get_memo_info()
+    averaged_expenses: pd.Series = monthly_costs.get_averaged_expenses_by_label()
+    assert monthly_costs.get_memo_info()[:2] == (hits + 1, misses)
+    assert monthly_costs.get_monthly_transactions(['Label']) is (
+        monthly_costs.get_monthly_transactions(['Label'])
+    )
+
+    monthly_costs.drop_costs('test_label', 'test_sublabel')
+    assert monthly_costs.get_memo_info().size == 0
+    assert monthly_costs.get_averaged_expenses_by_label().empty
+    assert not averaged_expenses.empty
+
+
+def test_memoize_keyword_arguments(monthly_costs) -> None:
+    df: pd.DataFrame = monthly_costs.get_monthly_transactions(['Label'])
+    assert monthly_costs.get_monthly_transactions(additional_labels=['Label']) is df
+    assert monthly_costs.get_monthly_transactions() is monthly_costs.get_monthly_transactions([])
+
+
+def test_memoize_size(monthly_costs, monkeypatch) -> None:
+    monkeypatch.setattr('myfinances.monthly_transactions.MEMO_SIZE', 2)
+    for label in ['a', 'b', 'c']:
+        monthly_costs.get_averaged_expenses_by_sublabel(label)
+    assert monthly_costs.get_memo_info().size == 2
+
+
+@pytest.mark.parametrize(
+    'sublabels, n_active',
+    [
+        ({'test_label': ['test_sublabel', 'other']}, 91),
+        ({'test_label': ['other'], 'other_label': ['test_sublabel']}, 45),
+        ({'test_label': ['unknown'], 'unknown': ['other']}, 0),
+        ({}, 0),
+    ],
+)
+def test_set_active_sublabels(df_test, month_split_day, sublabels, n_active) -> None:
+    df_test.loc[df_test.index[::2], TransactionLabeled.Sublabel] = 'other'
+    monthly_costs: MonthlyCosts = MonthlyCosts(df_test, month_split_day)
+    monthly_costs.set_active_sublabels(sublabels)
+    df: DataFrame[TransactionLabeled] = monthly_costs.get_all_transactions_in_dates()
+    active: pd.Series = pd.Series(False, index=df.index)
+    for label, active_sublabels in sublabels.items():
+        active |= (df[TransactionLabeled.Label] == label) & (
+            df[TransactionLabeled.Sublabel].isin(active_sublabels)
+        )
+    pd.testing.assert_frame_equal(monthly_costs.get_transactions(), df.loc[active])
+    assert monthly_costs.get_transactions().shape[0] == n_active
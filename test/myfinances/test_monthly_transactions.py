@@ -1,10 +1,17 @@
+import numpy as np
 import pandas as pd
 import pytest
 from pandas._libs import NaTType
 from pandera.typing import DataFrame
 
 from myfinances.label_data import TransactionLabeled
-from myfinances.monthly_transactions import MonthlyTransactions
+from myfinances.monthly_transactions import (
+    MonthlyTransactions,
+    get_month_boundaries,
+    get_month_code,
+    get_month_codes,
+    get_month_starts,
+)
 from myfinances.utils import get_next_month, get_previous_day
 
 
@@ -234,3 +241,46 @@ def test_iterate_months(monthly_transactions, month_split_day) -> None:
         assert start_date.day == month_split_day
         assert end_date.day == get_previous_day(get_next_month(start_date)).day
         pd.testing.assert_frame_equal(df, df_expected)
+
+
+def test_iterate_months_after_split_day_change(monthly_transactions, month_split_day) -> None:
+    monthly_transactions.set_month_split_day(3 if month_split_day != 3 else 4)
+    test_iterate_months(monthly_transactions, monthly_transactions.get_month_split_day())
+    assert (
+        len(list(monthly_transactions.iterate_months()))
+        == monthly_transactions.get_n_months_to_analyze()
+    )
+
+
+def test_iterate_months_yields_empty_months(monthly_transactions) -> None:
+    months_to_analyze_start: list[pd.Timestamp] = monthly_transactions.get_months_to_analyze_start()
+    monthly_transactions._mask = (
+        monthly_transactions._df[TransactionLabeled.Date] >= months_to_analyze_start[-1]
+    )
+    n_transactions: list[int] = [df.shape[0] for df in monthly_transactions.iterate_months()]
+    assert len(n_transactions) == len(months_to_analyze_start)
+    assert n_transactions[:-1] == [0] * (len(months_to_analyze_start) - 1)
+    assert n_transactions[-1] > 0
+
+
+def test_get_month_codes() -> None:
+    dates: pd.Series = pd.Series(pd.to_datetime(['1970-01-14', '1970-01-15', '2024-03-15']))
+    assert get_month_codes(dates, 15).tolist() == [-1, 0, 650]
+    assert get_month_code(pd.Timestamp(year=2024, month=3, day=15), 15) == 650
+    np.testing.assert_array_equal(
+        get_month_starts(np.array([-1, 650]), 15),
+        pd.to_datetime(['1969-12-15', '2024-03-15']).to_numpy(),
+    )
+
+
+def test_get_month_boundaries() -> None:
+    months_start, months_end = get_month_boundaries(
+        pd.Timestamp(year=2023, month=12, day=27), pd.Timestamp(year=2024, month=3, day=1), 27
+    )
+    np.testing.assert_array_equal(
+        months_start, pd.to_datetime(['2023-12-27', '2024-01-27', '2024-02-27']).to_numpy()
+    )
+    np.testing.assert_array_equal(
+        months_end, pd.to_datetime(['2024-01-26', '2024-02-26', '2024-03-26']).to_numpy()
+    )
+    assert not months_start.flags.writeable
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from myfinances.config_utils import InputConfig
+from myfinances.parse_cache import FileState, ParseCache, cache_key, file_state
+
+
+@pytest.fixture
+def transaction_file(tmp_path) -> Path:
+    fn: Path = tmp_path / 'transaction.csv'
+    fn.write_text('date,amount,description\n2024-01-01,1.5,Coffee\n')
+    return fn
+
+
+@pytest.fixture
+def input_config(transaction_file) -> InputConfig:
+    config: dict = {
+        'Account': 'Test',
+        'Files': [transaction_file.name],
+        'Delimiter': ',',
+        'Decimal': '.',
+        'DateKey': 'date',
+        'DateFormat': '%Y-%m-%d',
+        'AmountKey': 'amount',
+        'TextKeys': ['description'],
+    }
+    return InputConfig.model_validate(config, context={'base': transaction_file.parent})
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'Date': [pd.Timestamp(year=2024, month=1, day=1)],
+            'Text': ['Coffee'],
+            'Amount': [1.5],
+            'Account': ['Test'],
+        }
+    )
+
+
+def test_cache_roundtrip(tmp_path, df) -> None:
+    cache: ParseCache = ParseCache(tmp_path / 'cache')
+    assert cache.load('key') is None
+    cache.store('key', df)
+    pd.testing.assert_frame_equal(cache.load('key'), df)
+
+
+def test_cache_evict(tmp_path, df) -> None:
+    cache: ParseCache = ParseCache(tmp_path / 'cache')
+    owner: Path = tmp_path / 'inputs.yaml'
+    other_owner: Path = tmp_path / 'other_inputs.yaml'
+    owner.touch()
+    other_owner.touch()
+    cache.store('source-stale', df)
+    cache.evict(['source-stale'], {str(owner): ['source']})
+    cache.store('other-used', df)
+    cache.evict(['other-used'], {str(other_owner): ['other']})
+    cache.store('source-fresh', df)
+    cache.store('removed-unused', df)
+    cache.evict(['source-fresh'], {str(owner): ['source']})
+    assert cache.load('source-stale') is None
+    assert cache.load('source-fresh') is not None
+    assert cache.load('other-used') is not None
+    assert cache.load('removed-unused') is None
+
+    other_owner.unlink()
+    cache.evict(['source-fresh'], {str(owner): ['source']})
+    assert cache.load('other-used') is None
+
+
+def test_cache_key_changes_with_content(transaction_file, input_config) -> None:
+    key: str = cache_key(transaction_file, input_config)
+    assert key == cache_key(transaction_file, input_config)
+    with open(transaction_file, 'a') as f:
+        f.write('2024-01-02,2.5,Tea\n')
+    assert key != cache_key(transaction_file, input_config)
+
+
+def test_cache_key_changes_with_config(transaction_file, input_config) -> None:
+    key: str = cache_key(transaction_file, input_config)
+    input_config.Account = 'Other'
+    assert key != cache_key(transaction_file, input_config)
+
+
+def test_file_state_is_prefix_of(transaction_file) -> None:
+    state: FileState | None = file_state(transaction_file, 'key', 1)
+    assert state is not None
+    with open(transaction_file, 'a') as f:
+        f.write('2024-01-02,2.5,Tea\n')
+    assert state.is_prefix_of(transaction_file)
+    transaction_file.write_text('date,amount,description\n2024-01-01,1.5,Cake\n')
+    assert not state.is_prefix_of(transaction_file)
+
+
+def test_file_state_incomplete_row(transaction_file) -> None:
+    with open(transaction_file, 'a') as f:
+        f.write('2024-01-02,2.5,Tea')
+    assert file_state(transaction_file, 'key', 1) is None
@@ -1,9 +1,13 @@
 from pathlib import Path
+from typing import get_args
 
 import pandas as pd
+import pyarrow as pa
 import pytest
+import yaml
 
 import myfinances.parse_data as prsd
+from myfinances.config_utils import InputConfig, to_config
 
 
 @pytest.fixture
@@ -37,6 +41,18 @@ def test_load_generic(transaction_file) -> None:
     pd.testing.assert_frame_equal(df, df_expected)
 
 
+@pytest.mark.parametrize(('delimiter', 'decimal'), [(',', '.'), (';', ',')])
+@pytest.mark.parametrize('memory_map', [False, True])
+def test_load_arrow(tmp_path, delimiter, decimal, memory_map) -> None:
+    fn: Path = tmp_path / 'transaction.csv'
+    fn.write_text(
+        f'a{delimiter}b{delimiter}c{delimiter}d\n1{decimal}41{delimiter}2{decimal}0{delimiter}{delimiter}3{decimal}1\n'
+    )
+    df: pd.DataFrame = prsd.load_arrow(fn, delimiter, decimal, memory_map=memory_map)
+    df_expected: pd.DataFrame = pd.DataFrame({'a': [1.41], 'b': [2.0], 'd': [3.1]})
+    pd.testing.assert_frame_equal(df, df_expected.astype(pd.ArrowDtype(pa.float64())))
+
+
 @pytest.fixture
 def df_amount() -> pd.DataFrame:
     df: pd.DataFrame = pd.DataFrame({'a': [1.0, 2.0], 'b': ['1,0', '2,0']})
@@ -50,6 +66,29 @@ def test_parse_amount(df_amount, key) -> None:
     pd.testing.assert_series_equal(df, df_expected)
 
 
+@pytest.mark.parametrize(
+    ('values', 'decimal', 'thousands', 'expected'),
+    [
+        (['1.234,56', '-1.234,5', '+7,0', '12,5-'], ',', '.', [1234.56, -1234.5, 7.0, -12.5]),
+        (['1,234.56', '-0.5', '3-', None], '.', ',', [1234.56, -0.5, -3.0, None]),
+    ],
+)
+@pytest.mark.parametrize('dtype', [object, pd.ArrowDtype(pa.string())])
+def test_parse_amount_separators(values, decimal, thousands, expected, dtype) -> None:
+    df: pd.DataFrame = pd.DataFrame({'a': values}, dtype=dtype)
+    amount: pd.Series = prsd.parse_amount(df, 'a', decimal, thousands)
+    pd.testing.assert_series_equal(amount, pd.Series(expected, name='a', dtype=float))
+
+
+@pytest.mark.parametrize('dtype', [object, pd.ArrowDtype(pa.string())])
+def test_parse_amount_malformed(dtype) -> None:
+    df: pd.DataFrame = pd.DataFrame({'a': ['1,0', '2,0', '3,O']}, dtype=dtype)
+    with pytest.raises(ValueError) as error:
+        prsd.parse_amount(df, 'a', ',', '.', 'transactions.csv')
+    assert 'transactions.csv' in str(error.value)
+    assert 'line 4' in str(error.value)
+
+
 @pytest.fixture
 def df_dates() -> pd.DataFrame:
     df: pd.DataFrame = pd.DataFrame({'a': ['04-10-2023'], 'b': ['04-10-23']})
@@ -68,3 +107,175 @@ def test_parse_text() -> None:
     df: pd.Series = prsd.parse_text(df_unprocessed, ['a', 'b'])
     df_expected: pd.Series = pd.Series(['a;b', '-;c'])
     pd.testing.assert_series_equal(df, df_expected)
+
+
+@pytest.fixture
+def inputs_config(tmp_path) -> Path:
+    inputs: str = """
+- Account: 'Test'
+  Files:
+    - 'transactions.csv'
+  Delimiter: ';'
+  Decimal: ','
+  DateKey: 'date'
+  DateFormat: '%d.%m.%Y'
+  AmountKey: 'amount'
+  TextKeys:
+    - 'text'
+    """
+    fn: Path = tmp_path / 'inputs.yaml'
+    fn.write_text(inputs)
+    (tmp_path / 'transactions.csv').write_text(
+        'date;amount;text\n01.01.2024;1.234,5;Rent\n02.01.2024;-3,5;Coffee\n'
+    )
+    return fn
+
+
+@pytest.mark.parametrize('engine', get_args(InputConfig.model_fields['Engine'].annotation))
+@pytest.mark.parametrize('dtype_backend', ['numpy', 'pyarrow'])
+def test_parse_file_german_amounts(inputs_config, tmp_path, engine, dtype_backend) -> None:
+    (tmp_path / 'transactions.csv').write_text(
+        'date;amount;text\n01.01.2024;1.234,56;Rent\n02.01.2024;-12,50;Coffee\n'
+        '03.01.2024;12,50-;Tea\n'
+    )
+    input_config: InputConfig = to_config(inputs_config, list[InputConfig])[0]
+    input_config.Engine = engine
+    input_config.DtypeBackend = dtype_backend
+    df: pd.DataFrame = prsd.parse_file(tmp_path / 'transactions.csv', input_config)
+    assert df['Amount'].to_list() == [1234.56, -12.5, -12.5]
+
+
+def test_load_data_incremental(inputs_config, tmp_path) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    with open(tmp_path / 'transactions.csv', 'a') as f:
+        f.write('03.01.2024;-4;Tea\n')
+
+    df: pd.DataFrame = prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    pd.testing.assert_frame_equal(df, prsd.load_data(inputs_config))
+    assert df.shape[0] == 3
+    assert len(list(cache_dir.glob('*.parquet'))) == 1
+
+
+def test_load_data_incremental_after_plain_run(inputs_config, tmp_path, monkeypatch) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    with open(tmp_path / 'transactions.csv', 'a') as f:
+        f.write('03.01.2024;-4;Tea\n')
+    prsd.load_data(inputs_config, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob('*.json'))) == 1
+    with open(tmp_path / 'transactions.csv', 'a') as f:
+        f.write('04.01.2024;-5;Cake\n')
+
+    offsets: list[int] = []
+    parse_file = prsd.parse_file
+    monkeypatch.setattr(
+        prsd,
+        'parse_file',
+        lambda file, input_config, offset=0, *args: (
+            offsets.append(offset) or parse_file(file, input_config, offset, *args)
+        ),
+    )
+    df: pd.DataFrame = prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    assert offsets[0] > 0
+    pd.testing.assert_frame_equal(df, prsd.load_data(inputs_config))
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_load_data_malformed_amount_line(inputs_config, tmp_path, incremental) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    with open(tmp_path / 'transactions.csv', 'a') as f:
+        f.write('03.01.2024;-4;Tea\n04.01.2024;-4,O;Cake\n')
+    with pytest.raises(ValueError) as error:
+        prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=incremental)
+    assert 'transactions.csv, line 5' in str(error.value)
+
+
+def test_load_data_incremental_rewritten(inputs_config, tmp_path) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    (tmp_path / 'transactions.csv').write_text(
+        'date;amount;text\n01.01.2024;1.234,5;Salary\n02.01.2024;-3,5;Coffee\n03.01.2024;-4;Tea\n'
+    )
+
+    df: pd.DataFrame = prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    pd.testing.assert_frame_equal(df, prsd.load_data(inputs_config))
+    assert df.loc[0, 'Text'] == 'Salary'
+
+
+def test_load_data_shared_cache(inputs_config, tmp_path, monkeypatch) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    inputs: list[dict] = yaml.safe_load(inputs_config.read_text())
+    inputs[0]['Account'] = 'Other'
+    other_config: Path = tmp_path / 'other_inputs.yaml'
+    other_config.write_text(yaml.safe_dump(inputs))
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    prsd.load_data(other_config, cache_dir=cache_dir, incremental=True)
+
+    parsed: list = []
+    parse_files = prsd.parse_files
+    monkeypatch.setattr(
+        prsd, 'parse_files', lambda jobs, *args: parsed.extend(jobs) or parse_files(jobs, *args)
+    )
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    assert parsed == []
+    assert len(list(cache_dir.glob('*.parquet'))) == 2
+
+
+def test_load_data_removed_file(inputs_config, tmp_path) -> None:
+    cache_dir: Path = tmp_path / 'cache'
+    inputs: list[dict] = yaml.safe_load(inputs_config.read_text())
+    inputs[0]['Files'].append('transactions_other.csv')
+    inputs_config.write_text(yaml.safe_dump(inputs))
+    (tmp_path / 'transactions_other.csv').write_text('date;amount;text\n03.01.2024;-4;Tea\n')
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    assert len(list(cache_dir.glob('*.parquet'))) == 2
+
+    inputs[0]['Files'].pop()
+    inputs_config.write_text(yaml.safe_dump(inputs))
+    prsd.load_data(inputs_config, cache_dir=cache_dir, incremental=True)
+    assert len(list(cache_dir.glob('*.parquet'))) == 1
+    assert len(list(cache_dir.glob('*.json'))) == 1
+
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_load_data_arrow_strings(inputs_config, tmp_path, engine) -> None:
+    inputs: list[dict] = yaml.safe_load(inputs_config.read_text())
+    inputs[0].update({'Engine': engine, 'DtypeBackend': 'pyarrow'})
+    inputs_config.write_text(yaml.safe_dump(inputs))
+    df: pd.DataFrame = prsd.load_data(inputs_config)
+    assert df['Text'].cat.categories.dtype == pd.ArrowDtype(pa.string())
+    assert df['Amount'].to_list() == [1234.5, -3.5]
+
+    for incremental in [False, True, True]:
+        df_cached: pd.DataFrame = prsd.load_data(
+            inputs_config, cache_dir=tmp_path / 'cache', incremental=incremental
+        )
+        pd.testing.assert_frame_equal(df_cached, df)
+
+    with open(tmp_path / 'transactions.csv', 'a') as f:
+        f.write('03.01.2024;-4;Tea\n')
+    df_appended: pd.DataFrame = prsd.load_data(
+        inputs_config, cache_dir=tmp_path / 'cache', incremental=True
+    )
+    pd.testing.assert_frame_equal(df_appended, prsd.load_data(inputs_config))
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_load_data_overlapping_files(inputs_config, tmp_path, cached) -> None:
+    inputs: list[dict] = yaml.safe_load(inputs_config.read_text())
+    inputs[0]['Files'].append('transactions_overlap.csv')
+    inputs_config.write_text(yaml.safe_dump(inputs))
+    (tmp_path / 'transactions.csv').write_text(
+        'date;amount;text\n01.01.2024;-3,5;Coffee\n01.01.2024;-3,5;Coffee\n02.01.2024;-4;Tea\n'
+    )
+    (tmp_path / 'transactions_overlap.csv').write_text(
+        'date;amount;text\n01.01.2024;-3,5;Coffee\n02.01.2024;-4;Tea\n03.01.2024;-4;Tea\n'
+    )
+    cache_dir: Path | None = tmp_path / 'cache' if cached else None
+
+    df: pd.DataFrame = prsd.load_data(inputs_config, cache_dir=cache_dir)
+    assert df['Text'].to_list() == ['Coffee', 'Coffee', 'Tea', 'Tea']
+    assert df['Date'].dt.day.to_list() == [1, 1, 2, 3]
+    pd.testing.assert_frame_equal(prsd.load_data(inputs_config, cache_dir=cache_dir), df)
@@ -2,6 +2,7 @@ import pandas as pd
 from pandera.typing import DataFrame
 
 import myfinances.rename_transactions as rt
+from myfinances.config_utils import RenameConfig
 from myfinances.parse_data import Transaction
 
 
@@ -12,5 +13,53 @@ def test_rename_transaction() -> None:
     df_expected: pd.DataFrame = pd.DataFrame(
         {Transaction.Text: ['Methane', 'Methane', 'Propane', 'Methane']}
     )
-    df: DataFrame[Transaction] = rt.rename_transaction(df_to_rename, 'CH4', 'Methane')
+    df: DataFrame[Transaction] = rt.rename_by_configs(
+        df_to_rename, [RenameConfig(old_text='CH4', new_text='Methane')]
+    )
+    pd.testing.assert_frame_equal(df, df_expected)
+
+
+def test_rename_transaction_categorical() -> None:
+    df_to_rename: DataFrame[Transaction] = pd.DataFrame(
+        {Transaction.Text: pd.Categorical(['CH4', 'Methane', 'Propane', 'CH4'])}
+    )  # type: ignore
+    df_expected: pd.DataFrame = pd.DataFrame(
+        {Transaction.Text: pd.Categorical(['Methane', 'Methane', 'Propane', 'Methane'])}
+    )
+    df: DataFrame[Transaction] = rt.rename_by_configs(
+        df_to_rename, [RenameConfig(old_text='CH4', new_text='Methane')]
+    )
     pd.testing.assert_frame_equal(df, df_expected)
+
+
+def test_rename_transaction_literal() -> None:
+    df_to_rename: DataFrame[Transaction] = pd.DataFrame({Transaction.Text: ['C.4', 'CH4', 'C.4+']})  # type: ignore
+    df: DataFrame[Transaction] = rt.rename_by_configs(
+        df_to_rename, [RenameConfig(old_text='C.4', new_text='Methane')]
+    )
+    assert df[Transaction.Text].to_list() == ['Methane', 'CH4', 'C.4+']
+
+
+def test_compose_renames() -> None:
+    rename_configs: list[RenameConfig] = [
+        RenameConfig(old_text='a', new_text='x'),
+        RenameConfig(old_text='b', new_text='a'),
+        RenameConfig(old_text='x', new_text='b'),
+    ]
+    renames, renamed_by_rule = rt.compose_renames(rename_configs)
+    assert renames == {'a': 'b', 'b': 'a', 'x': 'b'}
+    assert renamed_by_rule == [['a'], ['b'], ['a', 'x']]
+
+
+def test_rename_by_configs_chained() -> None:
+    rename_configs: list[RenameConfig] = [
+        RenameConfig(old_text='a', new_text='x'),
+        RenameConfig(old_text='b', new_text='a'),
+        RenameConfig(old_text='x', new_text='b'),
+    ]
+    df_to_rename: DataFrame[Transaction] = pd.DataFrame(
+        {Transaction.Text: pd.Categorical(['a', 'b', 'x', 'c', 'a'])}
+    )  # type: ignore
+    assert rt.count_rename_hits(df_to_rename, rt.compose_renames(rename_configs)[1]) == [2, 1, 3]
+    df: DataFrame[Transaction] = rt.rename_by_configs(df_to_rename, rename_configs)
+    assert df[Transaction.Text].to_list() == ['b', 'a', 'b', 'c', 'b']
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandera.typing import DataFrame
+
+from myfinances.config_utils import Configs, to_config
+from myfinances.label_cache import LabelCache
+from myfinances.label_data import TransactionLabeled
+from myfinances.main import get_labled_data
+from myfinances.parse_data import Transaction
+from myfinances.stream_data import StreamingLabeler, get_labled_data_streaming
+
+
+@pytest.fixture
+def config_paths() -> Configs:
+    config_paths: Configs = to_config(
+        Path(__file__).parents[1] / 'data/config/default_public.yaml', Configs
+    )
+    return config_paths
+
+
+@pytest.mark.parametrize('chunksize', [250, 10_000])
+def test_get_labled_data_streaming(config_paths, chunksize) -> None:
+    df: DataFrame[TransactionLabeled] = get_labled_data_streaming(config_paths, chunksize)
+    pd.testing.assert_frame_equal(df, get_labled_data(config_paths))
+
+
+def test_get_labled_data_streaming_cached(config_paths, tmp_path) -> None:
+    df_expected: DataFrame[TransactionLabeled] = get_labled_data(config_paths)
+    for _ in range(2):
+        df: DataFrame[TransactionLabeled] = get_labled_data_streaming(
+            config_paths, 250, cache_dir=tmp_path
+        )
+        pd.testing.assert_frame_equal(df, df_expected)
+    labeler: StreamingLabeler = StreamingLabeler(config_paths, cache_dir=tmp_path)
+    cache: LabelCache = labeler.label_engine.label_cache  # type: ignore
+    assert cache.get_missing_texts(df_expected[TransactionLabeled.Text].cat.categories) == []
+
+
+def test_drop_seen_rows(config_paths) -> None:
+    labeler: StreamingLabeler = StreamingLabeler(config_paths)
+    df: DataFrame[Transaction] = pd.DataFrame(
+        {
+            Transaction.Date: [pd.Timestamp(year=2024, month=1, day=1)] * 3,
+            Transaction.Text: ['a', 'b', 'a'],
+            Transaction.Amount: [1.0, 1.0, 1.0],
+            Transaction.Account: ['Test'] * 3,
+        }
+    )  # type: ignore
+    labeler.start_file()
+    assert labeler.drop_seen_rows(df)[Transaction.Text].to_list() == ['a', 'b', 'a']
+    assert labeler.drop_seen_rows(df.iloc[:1])[Transaction.Text].to_list() == ['a']
+    labeler.start_file()
+    assert labeler.drop_seen_rows(df.iloc[:2]).empty
+    assert labeler.drop_seen_rows(df)[Transaction.Text].to_list() == ['b']
+    assert labeler.seen_fingerprints.dtype == np.uint64
+    assert labeler.seen_fingerprints.size == 4
+
+
+def test_check_dropped_across_chunks(config_paths) -> None:
+    labeler: StreamingLabeler = StreamingLabeler(config_paths)
+    with pytest.raises(KeyError):
+        labeler.check_dropped()
@@ -14,8 +14,19 @@ from myfinances.transaction_loader import TransactionLoader
 
 @pytest.fixture()
 def test_df() -> DataFrame[TransactionLabeled]:
-    df = TransactionLabeled.example(size=1)
-    return cast(DataFrame[TransactionLabeled], df)
+    df = pd.DataFrame(
+        {
+            TransactionLabeled.Date: [pd.Timestamp('2024-01-01')],
+            TransactionLabeled.Text: pd.Categorical(['text']),
+            TransactionLabeled.Amount: [1.0],
+            TransactionLabeled.Account: pd.Categorical(['account']),
+            TransactionLabeled.Label: pd.Categorical(['label']),
+            TransactionLabeled.Sublabel: pd.Categorical(['sublabel']),
+            TransactionLabeled.IsIncome: [False],
+            TransactionLabeled.RuleId: [0],
+        }
+    )
+    return cast(DataFrame[TransactionLabeled], TransactionLabeled.validate(df))
 
 
 class ConfigPathsMock:
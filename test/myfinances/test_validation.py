@@ -0,0 +1,87 @@
+import pandas as pd
+import pandera.errors
+import pytest
+from pandera.typing import DataFrame
+
+from myfinances.label_data import TransactionLabeled
+from myfinances.parse_data import Transaction
+from myfinances.validation import (
+    VALIDATION_ENV,
+    ValidationLevel,
+    check_types,
+    get_validation_level,
+    set_validation_level,
+)
+
+
+@check_types
+def identity(df: DataFrame[Transaction]) -> DataFrame[Transaction]:
+    return df
+
+
+@pytest.fixture
+def invalid_transactions() -> pd.DataFrame:
+    df: pd.DataFrame = pd.DataFrame(
+        {
+            Transaction.Date: pd.to_datetime(['2024-01-01'] * 2_000),
+            Transaction.Text: pd.Categorical(['Coffee'] * 2_000),
+            Transaction.Amount: 1.5,
+            Transaction.Account: pd.Categorical(['Test'] * 2_000),
+        }
+    )
+    df.loc[1_999, Transaction.Amount] = float('nan')
+    return df
+
+
+@pytest.fixture
+def validation_level():
+    yield
+    set_validation_level(ValidationLevel.FULL)
+
+
+def test_full_validation_raises(invalid_transactions):
+    with pytest.raises(pandera.errors.SchemaError):
+        identity(invalid_transactions)
+
+
+def test_sample_validation_checks_dtypes(invalid_transactions, validation_level):
+    set_validation_level(ValidationLevel.SAMPLE, sample_size=10)
+    identity(invalid_transactions)
+    with pytest.raises(pandera.errors.SchemaError):
+        identity(invalid_transactions.astype({Transaction.Amount: str}))
+
+
+def test_validation_off(invalid_transactions, validation_level):
+    set_validation_level('off')
+    df: pd.DataFrame = identity(invalid_transactions.astype({Transaction.Amount: str}))
+    assert df is not None
+
+
+def test_validation_level_from_env(monkeypatch, validation_level):
+    monkeypatch.setattr('myfinances.validation._validation_level', None)
+    monkeypatch.setenv(VALIDATION_ENV, 'sample')
+    assert get_validation_level() == ValidationLevel.SAMPLE
+
+
+@pytest.mark.parametrize('column', [Transaction.Text, Transaction.Account])
+def test_validation_non_string_categories(invalid_transactions, validation_level, column):
+    invalid_transactions[column] = pd.Categorical(['Coffee'] * 1_999 + [1])
+    with pytest.raises(pandera.errors.SchemaError):
+        identity(invalid_transactions)
+    set_validation_level(ValidationLevel.SAMPLE, sample_size=10)
+    with pytest.raises(pandera.errors.SchemaError):
+        identity(invalid_transactions)
+
+
+@pytest.mark.parametrize('column', [TransactionLabeled.Label, TransactionLabeled.Sublabel])
+def test_validation_non_string_label_categories(invalid_transactions, column):
+    df: pd.DataFrame = invalid_transactions.dropna().assign(
+        Label=pd.Categorical(['food'] * 1_999),
+        Sublabel=pd.Categorical(['coffee'] * 1_999),
+        IsIncome=False,
+        RuleId=0,
+    )
+    TransactionLabeled.validate(df)
+    df[column] = pd.Categorical([1] * 1_999)
+    with pytest.raises(pandera.errors.SchemaError):
+        TransactionLabeled.validate(df)
@@ -0,0 +1,79 @@
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandera.typing import DataFrame
+
+from myfinances.config_utils import Configs, to_config
+from myfinances.label_data import TransactionLabeled
+from myfinances.main import get_labled_data
+from myfinances.watch import LabelWatcher
+
+
+@pytest.fixture
+def config_file(tmp_path) -> Path:
+    shutil.copytree(Path(__file__).parents[1] / 'data', tmp_path / 'data')
+    return tmp_path / 'data/config/default_public.yaml'
+
+
+def touch(file: Path, content: str) -> None:
+    mtime_ns: int = file.stat().st_mtime_ns
+    file.write_text(content)
+    os.utime(file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+
+
+def test_label_watcher(config_file) -> None:
+    df_expected: DataFrame[TransactionLabeled] = get_labled_data(to_config(config_file, Configs))
+    watcher: LabelWatcher = LabelWatcher(config_file)
+    watcher.poll()
+    pd.testing.assert_frame_equal(watcher.df_labeled, df_expected)
+
+    food_config: Path = config_file.parent / 'public/labels/food.yaml'
+    food: str = food_config.read_text()
+    touch(food_config, food.replace('"Coffee shop"', '"Coffee bar"'))
+    watcher.poll()
+    unlabeled: pd.DataFrame = watcher.df_labeled[
+        watcher.df_labeled[TransactionLabeled.Label].isna()
+    ]
+    assert not unlabeled.empty
+    assert unlabeled[TransactionLabeled.Text].str.startswith('Coffee shop').all()
+
+    touch(food_config, food + '  groceries: [\n')
+    watcher.poll()
+    assert watcher.df_labeled is not None
+
+    touch(food_config, food)
+    watcher.poll()
+    pd.testing.assert_frame_equal(watcher.df_labeled, df_expected, check_categorical=False)
+
+
+def test_label_watcher_overlapping_identifier(config_file) -> None:
+    watcher: LabelWatcher = LabelWatcher(config_file)
+    watcher.poll()
+    df_labeled: DataFrame[TransactionLabeled] = watcher.df_labeled  # type: ignore
+
+    food_config: Path = config_file.parent / 'public/labels/food.yaml'
+    food: str = food_config.read_text()
+    touch(
+        food_config, food.replace('    - "Groceries"\n', '    - "Groceries"\n    - "Restaurant"\n')
+    )
+    watcher.poll()
+    assert 'Restaurant' not in watcher.rule_table['Identifier'].to_list()  # type: ignore
+    assert watcher.df_labeled is df_labeled
+
+
+def test_label_watcher_missing_label_config(config_file) -> None:
+    df_expected: DataFrame[TransactionLabeled] = get_labled_data(to_config(config_file, Configs))
+    watcher: LabelWatcher = LabelWatcher(config_file)
+    watcher.poll()
+
+    food_config: Path = config_file.parent / 'public/labels/food.yaml'
+    food_config_moved: Path = food_config.with_suffix('.yaml~')
+    food_config.rename(food_config_moved)
+    watcher.poll()
+    food_config_moved.rename(food_config)
+    touch(food_config, food_config.read_text())
+    watcher.poll()
+    pd.testing.assert_frame_equal(watcher.df_labeled, df_expected, check_categorical=False)
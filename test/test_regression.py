@@ -58,3 +58,19 @@ def test_renamed_transactions(config_paths: Configs, old_text: str, new_text: st
     assert not (
         transactions_renamed.loc[~rename_candidates, Transaction.Text].str.fullmatch(new_text).any()
     )
+
+
+def test_load_data_parallel(config_paths: Configs) -> None:
+    transactions_serial: DataFrame[Transaction] = load_data(config_paths.inputs_config)
+    transactions_parallel: DataFrame[Transaction] = load_data(config_paths.inputs_config, 2)
+    pd.testing.assert_frame_equal(transactions_parallel, transactions_serial)
+
+
+def test_load_data_cached(config_paths: Configs, tmp_path) -> None:
+    transactions: DataFrame[Transaction] = load_data(config_paths.inputs_config)
+    for _ in range(2):
+        transactions_cached: DataFrame[Transaction] = load_data(
+            config_paths.inputs_config, cache_dir=tmp_path
+        )
+        pd.testing.assert_frame_equal(transactions_cached, transactions)
+    assert len(list(tmp_path.glob('*.parquet'))) == 2